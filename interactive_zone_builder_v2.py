@@ -7,14 +7,23 @@ Optimized workflow for zone and pattern-based extraction configuration.
 
 import streamlit as st
 import re
+import functools
+import hashlib
+import html
+import json
 from pathlib import Path
 from PIL import Image
-from typing import List
-from collections import defaultdict, Counter
+from typing import Optional, Sequence
+from collections import defaultdict
 import io
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import modular components
@@ -27,7 +36,8 @@ from zone_builder.exporters import (
     export_to_python, preview_zone_status
 )
 from zone_builder.zone_operations import (
-    calculate_aggregate_zone, extract_from_zone, extract_from_zone_multimodel,
+    apply_clustering, calculate_aggregate_zone, extract_from_zone, extract_from_zone_multimodel,
+    extract_from_zone_multimodel_with_words, get_consensus_from_models, ocr_words_with_geom, word_bbox_array,
 )
 from zone_builder.ocr_utils import (
     call_ocr_api, extract_words, draw_visualization
@@ -64,6 +74,11 @@ FRANCE_FIELDS = [
     "first_name", "sex", "date_of_birth", "birth_place", "height",
     "address", "expiration_date", "issue_date", "issuing_authority"
 ]
+_ALL_FIELDS = tuple(dict.fromkeys(USA_FIELDS + FRANCE_FIELDS))  # All, remove duplicates
+_REGION_FIELDS = {'All': _ALL_FIELDS, 'USA': USA_FIELDS, 'France': FRANCE_FIELDS}
+_FIELD_COUNTS = {region: len(fields) for region, fields in _REGION_FIELDS.items()}
+REGIONS = tuple(_REGION_FIELDS)
+_REGION_INDEX = {region: i for i, region in enumerate(REGIONS)}
 
 # Session state initialization with robust error handling
 def init_session_state():
@@ -115,17 +130,225 @@ st.markdown("""
         border-radius: 8px;
         margin-bottom: 1rem;
     }
+    /* Test Mode per-model rows */
+    .zb-row {
+        margin: 2px 0;
+        padding: 2px 6px;
+        border-left: 2px solid;
+        border-radius: 3px;
+        font-size: 12px;
+    }
+    .zb-row-win { color: #28a745; background: #28a74515; }
+    .zb-row-mute { color: #6c757d; background: #6c757d15; }
+    .zb-tag { font-weight: bold; }
+    .zb-val { color: #333; margin-left: 4px; font-family: monospace; }
 </style>
 """, unsafe_allow_html=True)
 
 
-def get_filtered_fields(filter_type: str) -> List[str]:
+@functools.lru_cache(maxsize=1024)
+def _compile_cached(pattern: str, flags: int) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
+def _compile(pattern, flags: int = 0) -> re.Pattern:
+    """
+    Compile a regex, reusing compiled objects across Streamlit reruns
+
+    Raises re.error for invalid patterns (errors are not cached).
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile_cached(pattern, flags)
+
+
+def _safe_compile(pattern, flags: int = 0) -> Optional[re.Pattern]:
+    """Compile a regex, returning None instead of raising for invalid patterns"""
+    try:
+        return _compile(pattern, flags)
+    except re.error:
+        return None
+
+
+def _preview_validation_re(pattern: str) -> Optional[re.Pattern]:
+    """Compile a zone's validation pattern for a preview; an invalid one is reported and validation skipped"""
+    if not pattern:
+        return None
+    try:
+        return _compile(pattern)
+    except re.error as e:
+        st.warning(f"⚠️ Invalid validation pattern - values are shown unvalidated: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _norm_cached(value: str, field_format: str, field_name: Optional[str], opts_items: tuple):
+    """
+    Memoized normalize_field - models often agree and reruns repeat the same inputs
+
+    opts_items is tuple(sorted(format_options.items())) so the call is hashable.
+    """
+    return normalize_field(value, field_format, field_name, **dict(opts_items))
+
+
+# Format-specific normalizer option per field format: (option name, default)
+_FMT_KEYS = {
+    'date': ('date_format', 'MM.DD.YYYY'),
+    'height': ('height_format', 'auto'),
+    'weight': ('weight_format', 'auto'),
+}
+
+
+def _fmt_opts(zone_config: dict) -> tuple:
+    """Get (field_format, format_options) for normalize_field from a zone config"""
+    field_format = zone_config.get('format', 'string')
+    if field_format in _FMT_KEYS:
+        key, default = _FMT_KEYS[field_format]
+        return field_format, {key: zone_config.get(key, default)}
+    return field_format, {}
+
+
+def _consensus_vote(model_values: dict, field_name: Optional[str], tie_break: Optional[str] = None) -> tuple:
+    """
+    Character-level vote across models, skipped when every model already agrees
+
+    Returns (text, vote_count, total_models) like get_consensus_from_models.
+    """
+    distinct = set(model_values.values())
+    if len(distinct) == 1:
+        total = len(model_values)
+        return distinct.pop(), total, total
+    return get_consensus_from_models(model_values, field_name, tie_break)
+
+
+def _normalize_and_vote(model_results: dict, field_format: str, field_name: Optional[str],
+                        opts_items: tuple, tie_break: Optional[str] = None) -> tuple:
+    """
+    Normalize each model's text, then character-vote on the normalized values
+
+    Returns (normalized per model, consensus, vote_count, total_models). Models whose
+    text normalizes to nothing are left out; if none remain the consensus is None.
+    """
+    model_results_normalized = {}
+    for model_key, raw_value in model_results.items():
+        normalized_value = _norm_cached(raw_value, field_format, field_name, opts_items) if raw_value else None
+        if normalized_value:
+            model_results_normalized[model_key] = normalized_value
+
+    if not model_results_normalized:
+        return model_results_normalized, None, 0, len(model_results)
+    return (model_results_normalized, *_consensus_vote(model_results_normalized, field_name, tie_break))
+
+
+def get_filtered_fields(filter_type: str) -> Sequence[str]:
     """Get field list based on filter"""
-    if filter_type == "USA":
-        return USA_FIELDS
-    elif filter_type == "France":
-        return FRANCE_FIELDS
-    return list(dict.fromkeys(USA_FIELDS + FRANCE_FIELDS))  # All, remove duplicates
+    return _REGION_FIELDS.get(filter_type, _ALL_FIELDS)
+
+
+@functools.lru_cache(maxsize=8)
+def build_field_options(filter_type: str, created: frozenset) -> tuple:
+    """Field dropdown entries: configured fields first, then available ones, under headers"""
+    fields = get_filtered_fields(filter_type)
+    created_fields = [f for f in fields if f in created]
+    available_fields = [f for f in fields if f not in created]
+
+    options = []
+    if created_fields:
+        options.append("── Configured ──")
+        options.extend([f"✅ {f}" for f in created_fields])
+    if available_fields:
+        if created_fields:
+            options.append("── Available ──")
+        options.extend(available_fields)
+    return tuple(options)
+
+
+def get_image(img_data: dict) -> Image.Image:
+    """Get the image's PIL object, decoding the uploaded bytes on first use"""
+    if 'image' not in img_data:
+        img_data['image'] = Image.open(io.BytesIO(img_data['image_bytes']))
+    return img_data['image']
+
+
+def get_word_bbox(img_data: dict):
+    """Get the image's cached word box array, building it on first use"""
+    if 'word_bbox' not in img_data:
+        img_data['word_bbox'] = word_bbox_array(img_data.get('words', []))
+    return img_data['word_bbox']
+
+
+def get_words_with_geom(img_data: dict) -> list:
+    """Get the image's OCR word geometry for multi-model extraction, building it on first use"""
+    if 'words_with_geom' not in img_data:
+        img_data['words_with_geom'] = ocr_words_with_geom(img_data.get('ocr_result', {}))
+    return img_data['words_with_geom']
+
+
+_EXTRACTION_CACHE_SIZE = 32  # Zone configs remembered per image
+
+
+def _cache_put(cache: dict, key, value, size: int = _EXTRACTION_CACHE_SIZE):
+    """Store value in a per-image cache, dropping the oldest entry when full"""
+    if key not in cache and len(cache) >= size:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
+def _zone_key(zone_config: dict) -> str:
+    """Stable short hash of a zone config (or any JSON-like dict)"""
+    payload = json.dumps(zone_config, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+_VIS_CACHE_SIZE = 4  # Encoded overlays remembered per image (each is a full JPEG)
+
+
+def get_visualization(img_data: dict, selections: set, zones: dict, current_field: str,
+                      image_scale: float = 1.0) -> bytes:
+    """
+    Get the image with overlays drawn, as JPEG bytes ready for st.image
+
+    Cached per image on selection, zones, field and display settings, so reruns that
+    change none of them skip both the drawing and the encode.
+    """
+    vis_cache = img_data.setdefault('vis_cache', {})
+    key = (frozenset(selections), current_field, _zone_key(zones),
+           _zone_key(st.session_state.settings.get('display', {})), image_scale)
+    if key not in vis_cache:
+        vis_img = draw_visualization(get_image(img_data), img_data['words'], selections, zones, current_field)
+        # A narrowed column shows fewer pixels - don't ship the full resolution
+        if image_scale < 1.0:
+            vis_img = vis_img.resize(
+                (max(1, int(vis_img.width * image_scale)), max(1, int(vis_img.height * image_scale))),
+                Image.BILINEAR
+            )
+        buf = io.BytesIO()
+        vis_img.convert('RGB').save(buf, 'JPEG', quality=85)
+        _cache_put(vis_cache, key, buf.getvalue(), _VIS_CACHE_SIZE)
+    return vis_cache[key]
+
+
+def get_zone_extraction(img_data: dict, zone_config: dict) -> dict:
+    """
+    Per-model (text, words) for a zone on one image, cached on img_data
+
+    Streamlit reruns the whole script on every widget interaction, so the
+    same zone is re-extracted many times while nothing changes. Results are
+    keyed by the zone config hash; editing the zone simply misses the cache.
+    """
+    cache = img_data.setdefault('extraction_cache', {})
+    key = _zone_key(zone_config)
+    if key not in cache:
+        _cache_put(cache, key, extract_from_zone_multimodel_with_words(
+            img_data.get('ocr_result', {}), zone_config, img_data.get('words', []), get_word_bbox(img_data),
+            get_words_with_geom(img_data)
+        ))
+    return cache[key]
+
+
+def get_zone_model_texts(img_data: dict, zone_config: dict) -> dict:
+    """Cached equivalent of extract_from_zone_multimodel for a build-mode image"""
+    return {model: text for model, (text, _) in get_zone_extraction(img_data, zone_config).items()}
 
 
 def process_extraction_result(consensus_text: str, zone_config: dict, field_name: str = None) -> tuple:
@@ -136,51 +359,74 @@ def process_extraction_result(consensus_text: str, zone_config: dict, field_name
     Applying it twice would cause incorrect results (production only applies it once).
     """
     # Normalize
-    field_format = zone_config.get('format', 'string')
-    format_options = {}
-    if field_format == 'date':
-        format_options['date_format'] = zone_config.get('date_format', 'MM.DD.YYYY')
-    elif field_format == 'height':
-        format_options['height_format'] = zone_config.get('height_format', 'auto')
-    elif field_format == 'weight':
-        format_options['weight_format'] = zone_config.get('weight_format', 'auto')
+    field_format, format_options = _fmt_opts(zone_config)
 
     # Pass field_name for field-specific cleaning (name/address fields)
-    normalized_text = normalize_field(consensus_text, field_format, field_name, **format_options) if consensus_text else None
+    normalized_text = _norm_cached(consensus_text, field_format, field_name, tuple(sorted(format_options.items()))) if consensus_text else None
 
     # Validate
     pattern = zone_config.get('pattern', '')
-    is_valid = bool(re.match(pattern, normalized_text)) if pattern and normalized_text else bool(normalized_text)
+    validation_re = _safe_compile(pattern) if pattern else None  # Invalid pattern: not validated (previews warn about it)
+    is_valid = bool(validation_re.match(normalized_text)) if validation_re and normalized_text else bool(normalized_text)
 
     return consensus_text, normalized_text, is_valid, field_format, format_options
 
 
-def render_model_outputs(model_results: dict, field_format: str, format_options: dict, pattern: str, field_name: str = None):
-    """Render per-model outputs with normalization preview (arrows show what WOULD happen, but voting uses RAW)"""
-    if not model_results:
-        return
-
-    st.markdown("**📊 Model RAW Outputs** (character voting uses these raw values):")
-    model_colors = {
-        'parseq': '#4CAF50', 'crnn': '#2196F3', 'vitstr': '#FF9800',
-        'sar': '#9C27B0', 'viptr': '#F44336'
-    }
-
-    for model_name, model_text in sorted(model_results.items()):
-        # Display empty strings as "(no match)" for clarity
-        display_text = model_text if model_text else "(no match)"
-
-        # Show what normalization WOULD produce (for reference, but voting happens on raw)
-        model_normalized = normalize_field(model_text, field_format, field_name, **format_options) if model_text else None
+def _test_pattern_on_text(zone_text, zone_words, compiled_pattern: re.Pattern,
+                          cleanup_re: Optional[re.Pattern], zone_config: dict, zone_matches: dict):
+    """
+    Test pattern on zone text, apply clustering to matched words, then cleanup
 
-        color = model_colors.get(model_name, '#666666')
+    Flow:
+    1. Apply pattern to zone_text → extract rough value
+    2. Find words that make up this value (by token matching)
+    3. Apply clustering to those words → filter to best cluster
+    4. Rebuild text from clustered words
+    5. Apply cleanup
 
-        # Show RAW with normalization preview (arrow shows what WOULD happen)
-        if model_text and model_text != model_normalized and model_normalized:
-            output_html = f"""
+    zone_matches memoizes pattern matches by zone text for the caller's pass.
+    """
+    extracted_value = None
+
+    # Step 1: Apply consensus_extract pattern to zone text (NOT clustered yet)
+    if zone_text:
+        if zone_text not in zone_matches:
+            match = compiled_pattern.search(zone_text)
+            # Extract value: use group(1) if capturing group exists, else group(0)
+            zone_matches[zone_text] = (match.group(1) if match.groups() else match.group(0)) if match else None
+        extracted_value = zone_matches[zone_text]
+
+    if not extracted_value:
+        return None
+
+    # Step 2: Apply clustering (if configured) to ALL zone words
+    # Pattern validates the zone has relevant data, clustering selects best cluster (e.g., highest line)
+    if zone_config.get('cluster_by') and zone_words:
+        clustered_words = apply_clustering(zone_words, zone_config)
+        if clustered_words:
+            # Rebuild text from clustered words
+            extracted_value = ' '.join([w.get('text', '') for w in clustered_words])
+        # If clustering removed all words, keep original extracted_value
+
+    # Step 3: Apply cleanup pattern (if enabled and pattern is valid)
+    if extracted_value and cleanup_re:
+        extracted_value = cleanup_re.sub('', extracted_value).strip()
+
+    return extracted_value
+
+
+# Display color per OCR model (unknown models fall back to grey)
+_MODEL_COLORS = {
+    'parseq': '#4CAF50', 'crnn': '#2196F3', 'vitstr': '#FF9800',
+    'sar': '#9C27B0', 'viptr': '#F44336'
+}
+_MODEL_ORDER = tuple(sorted(_MODEL_COLORS))  # Display order for the known models (alphabetical)
+
+# Per-model output blocks for render_model_outputs
+_MODEL_HTML_WITH_NORM = """
             <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {color}15, transparent); border-left: 3px solid {color}; border-radius: 4px;">
                 <span style="color: {color}; font-weight: bold; font-size: 14px;">
-                    {model_name.upper()}:
+                    {model_upper}:
                 </span>
                 <span style="color: #666; margin-left: 10px; font-family: monospace;">
                     {display_text}
@@ -191,25 +437,91 @@ def render_model_outputs(model_results: dict, field_format: str, format_options:
                 </span>
             </div>
             """
-        else:
-            output_html = f"""
+_MODEL_HTML_PLAIN = """
             <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {color}15, transparent); border-left: 3px solid {color}; border-radius: 4px;">
                 <span style="color: {color}; font-weight: bold; font-size: 14px;">
-                    {model_name.upper()}:
+                    {model_upper}:
                 </span>
                 <span style="color: #333; margin-left: 10px; font-family: monospace;">
                     {display_text}
                 </span>
             </div>
             """
-        st.markdown(output_html, unsafe_allow_html=True)
 
 
+def _model_templates(model_name: str, color: str) -> tuple:
+    """(with-normalization, plain) block templates with the model's color and label filled in"""
+    label = model_name.upper().replace('{', '{{').replace('}', '}}')
+    return tuple(
+        template.replace('{color}', color).replace('{model_upper}', label)
+        for template in (_MODEL_HTML_WITH_NORM, _MODEL_HTML_PLAIN)
+    )
+
+
+# Known models get their templates built once; only the text slots are left to format
+_MODEL_TEMPLATES = {name: _model_templates(name, color) for name, color in _MODEL_COLORS.items()}
+
+
+def render_model_outputs(model_results: dict, field_format: str, format_options: dict, pattern: str, field_name: str = None,
+                         prenormalized: Optional[dict] = None):
+    """
+    Render per-model outputs with normalization preview (arrows show what WOULD happen, but voting uses RAW)
+
+    prenormalized holds per-model values the caller already normalized for the vote;
+    only models missing from it are normalized here.
+    """
+    if not model_results:
+        return
+
+    st.markdown("**📊 Model RAW Outputs** (character voting uses these raw values):")
+
+    # Known models come out in the fixed order; only unexpected model names need a sort
+    if model_results.keys() <= _MODEL_COLORS.keys():
+        model_order = [m for m in _MODEL_ORDER if m in model_results]
+    else:
+        model_order = sorted(model_results)
+    texts = [model_results[m] for m in model_order]
+
+    # Show what normalization WOULD produce (for reference, but voting happens on raw)
+    prenormalized = prenormalized or {}
+    opts_items = tuple(sorted(format_options.items()))
+    normalized = [
+        prenormalized[m] if m in prenormalized
+        else (_norm_cached(t, field_format, field_name, opts_items) if t else None)
+        for m, t in zip(model_order, texts)
+    ]
+
+    # Show RAW with normalization preview (arrow shows what WOULD happen)
+    templates = [
+        (_MODEL_TEMPLATES.get(m) or _model_templates(m, '#666666'))[0 if t and n and t != n else 1]
+        for m, t, n in zip(model_order, texts, normalized)
+    ]
+
+    # Build every model's block first and send them as one markdown element
+    html_parts = [
+        template.format(
+            display_text=model_text if model_text else "(no match)",  # Empty strings shown as "(no match)"
+            model_normalized=model_normalized,
+        )
+        for model_text, model_normalized, template in zip(texts, normalized, templates)
+    ]
+
+    st.markdown(''.join(html_parts), unsafe_allow_html=True)
+
+
+@st.fragment
 def render_per_image_expandable(img_idx: int, img_data: dict, consensus_text: str, normalized_text: str,
                                 is_valid: bool, vote_count: int, total_models: int, model_results: dict,
                                 field_format: str, format_options: dict, pattern: str, field_name: str = None,
-                                empty_msg: str = "(empty)"):
-    """Render expandable section for a single image"""
+                                empty_msg: str = "(empty)", section: str = "zone",
+                                prenormalized: Optional[dict] = None):
+    """
+    Render expandable section for a single image
+
+    section distinguishes the previews that call this for the same field/image
+    (it is part of the per-image widget key). Runs as a fragment, so toggling
+    this image's model outputs reruns only this block, not every preview.
+    """
     status_icon = "✅" if is_valid else "❌"
     display_text = normalized_text or consensus_text or empty_msg
 
@@ -240,33 +552,39 @@ def render_per_image_expandable(img_idx: int, img_data: dict, consensus_text: st
 
         st.markdown("---")
         st.text(f"Step 1: Character voting on {total_models} RAW model outputs:")
-        render_model_outputs(model_results, field_format, format_options, pattern, field_name)
+
+        # Expander bodies run even when collapsed, so per-model rows are only built on request
+        if st.checkbox("Show model outputs", value=(img_idx == 0),
+                       key=f"show_models_{section}_{field_name}_{img_idx}"):
+            render_model_outputs(model_results, field_format, format_options, pattern, field_name,
+                                 prenormalized=prenormalized)
+
+
+def _set_view_mode(mode: str):
+    """Button callback: switch view mode before the rerun starts"""
+    if st.session_state.view_mode != mode:
+        st.session_state.view_mode = mode
 
 
 def render_header():
     """Simplified header with mode tabs"""
     col1, col2, col3 = st.columns(3)
 
+    # Callbacks run before the script, so the click's own rerun already renders the new mode
     with col1:
-        if st.button("🔨 **Build Mode**",
-                    type="primary" if st.session_state.view_mode == 'build' else "secondary",
-                    width='stretch'):
-            st.session_state.view_mode = 'build'
-            st.rerun()
+        st.button("🔨 **Build Mode**",
+                  type="primary" if st.session_state.view_mode == 'build' else "secondary",
+                  width='stretch', on_click=_set_view_mode, args=('build',))
 
     with col2:
-        if st.button("🧪 **Test Mode**",
-                    type="primary" if st.session_state.view_mode == 'test' else "secondary",
-                    width='stretch'):
-            st.session_state.view_mode = 'test'
-            st.rerun()
+        st.button("🧪 **Test Mode**",
+                  type="primary" if st.session_state.view_mode == 'test' else "secondary",
+                  width='stretch', on_click=_set_view_mode, args=('test',))
 
     with col3:
-        if st.button("📤 **Export Mode**",
-                    type="primary" if st.session_state.view_mode == 'export' else "secondary",
-                    width='stretch'):
-            st.session_state.view_mode = 'export'
-            st.rerun()
+        st.button("📤 **Export Mode**",
+                  type="primary" if st.session_state.view_mode == 'export' else "secondary",
+                  width='stretch', on_click=_set_view_mode, args=('export',))
 
 
 def render_sidebar():
@@ -316,6 +634,41 @@ def render_sidebar():
             render_settings_panel()
 
 
+_OCR_WORKERS = 8  # Concurrent OCR API requests
+_PROGRESS_INTERVAL = 0.2  # Seconds between progress/status redraws
+
+
+class _OCRFailed(Exception):
+    """Raised by _cached_ocr so failed calls are not cached"""
+
+
+@st.cache_data(show_spinner=False, max_entries=128, ttl=24 * 60 * 60)
+def _cached_ocr(img_hash: bytes, _img_bytes: bytes, filename: str, api_url: str) -> dict:
+    """OCR result cached by image content hash (the bytes themselves are not hashed again)"""
+    ocr_result = call_ocr_api(_img_bytes, filename, api_url)
+    if not ocr_result:
+        raise _OCRFailed(filename)
+    return ocr_result
+
+
+def get_ocr_result(img_bytes: bytes, filename: str, api_url: str) -> Optional[dict]:
+    """Call the OCR API, reusing results for images that were already processed"""
+    img_hash = hashlib.blake2b(img_bytes, digest_size=16).digest()
+    try:
+        return _cached_ocr(img_hash, img_bytes, filename, api_url)
+    except _OCRFailed:
+        return None
+
+
+def _ocr_executor(job_count: int) -> ThreadPoolExecutor:
+    """Thread pool for OCR requests; workers share the script context so st.cache_data works"""
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(
+        max_workers=max(1, min(_OCR_WORKERS, job_count)),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    )
+
+
 def process_images(uploaded_files, api_url):
     """Process images with OCR"""
     st.session_state.images = []
@@ -324,28 +677,46 @@ def process_images(uploaded_files, api_url):
     progress_bar = st.progress(0)
     status_text = st.empty()
 
-    for idx, file in enumerate(uploaded_files):
-        status_text.text(f"Processing {file.name} ({idx + 1}/{len(uploaded_files)})...")
+    # OCR is an HTTP round-trip per image, so send the requests concurrently
+    jobs = [(file, file.getvalue()) for file in uploaded_files]
+    ocr_results = [None] * len(jobs)
 
+    with _ocr_executor(len(jobs)) as executor:
+        futures = {
+            executor.submit(get_ocr_result, img_bytes, file.name, api_url): idx
+            for idx, (file, img_bytes) in enumerate(jobs)
+        }
+        last_update = 0.0
+        for done, future in enumerate(as_completed(futures), 1):
+            idx = futures[future]
+            try:
+                ocr_results[idx] = future.result()
+            except Exception as e:
+                st.error(f"Error processing {jobs[idx][0].name}: {str(e)}")
+            # Each widget update is a round-trip to the browser - redraw at most every _PROGRESS_INTERVAL
+            now = time.monotonic()
+            if done == len(jobs) or now - last_update >= _PROGRESS_INTERVAL:
+                last_update = now
+                status_text.text(f"Processing {jobs[idx][0].name} ({done}/{len(jobs)})...")
+                progress_bar.progress(done / len(jobs))
+
+    # Keep upload order regardless of which request finished first.
+    # Images stay as upload bytes and are decoded on first display (see get_image)
+    for (file, img_bytes), ocr_result in zip(jobs, ocr_results):
+        if not ocr_result:
+            continue
         try:
-            img_bytes = file.getvalue()
-            img = Image.open(io.BytesIO(img_bytes))
-            ocr_result = call_ocr_api(img_bytes, file.name, api_url)
-
-            if ocr_result:
-                words = extract_words(ocr_result)
-                st.session_state.images.append({
-                    'name': file.name,
-                    'image': img,
-                    'ocr_result': ocr_result,
-                    'words': words
-                })
-
+            Image.open(io.BytesIO(img_bytes))  # Header check only - rejects unreadable files now
+            words = extract_words(ocr_result)
+            st.session_state.images.append({
+                'name': file.name,
+                'image_bytes': img_bytes,
+                'ocr_result': ocr_result,
+                'words': words
+            })
         except Exception as e:
             st.error(f"Error processing {file.name}: {str(e)}")
 
-        progress_bar.progress((idx + 1) / len(uploaded_files))
-
     status_text.empty()
     progress_bar.empty()
 
@@ -391,11 +762,60 @@ def render_template_metadata():
     st.session_state.metadata['version'] = version
 
 
+def get_session_bytes() -> bytes:
+    """
+    save_session output, rebuilt only when something it saves has changed
+
+    Saving re-encodes every image as JPEG/base64 and gzips the OCR results,
+    which is far too slow to repeat on every sidebar rerun. Images are
+    compared by identity (they are replaced, never edited in place); the
+    rest of the saved state is small enough to hash.
+
+    The 'timestamp' save_session writes is therefore the time this cache
+    entry was built (the last change to the saved state), not the time of
+    a later download of the same bytes. The download file name still
+    carries the download time.
+    """
+    state = st.session_state
+    images = tuple(state.get('images', []))
+    state_key = _zone_key({
+        'zones': state.get('zones', {}),
+        'selections': {str(k): sorted(v) for k, v in state.get('selections', {}).items()},
+        'current_field': state.get('current_field'),
+        'current_image_idx': state.get('current_image_idx', 0),
+        'field_filter': state.get('field_filter', 'All'),
+        'zone_config_draft': state.get('zone_config_draft', {}),
+        'metadata': state.get('metadata'),
+    })
+
+    cached = state.get('session_bytes_cache')
+    if (cached and cached[1] == state_key and len(cached[0]) == len(images)
+            and all(a is b for a, b in zip(cached[0], images))):
+        return cached[2]
+
+    session_bytes = save_session(state)
+    state.session_bytes_cache = (images, state_key, session_bytes)
+    return session_bytes
+
+
+def get_image_options() -> list:
+    """Labels for the image selectbox, rebuilt only when the image list changes"""
+    state = st.session_state
+    images = state.images
+    cached = state.get('image_options_cache')
+    if cached and cached[0] is images and cached[1] == len(images):
+        return cached[2]
+
+    image_options = [f"{i+1}. {img['name'][:30]}" for i, img in enumerate(images)]
+    state.image_options_cache = (images, len(images), image_options)
+    return image_options
+
+
 def render_session_management():
     """Compact session management"""
     if st.session_state.images or st.session_state.zones:
-        # Create session bytes
-        session_bytes = save_session(st.session_state)
+        # Create session bytes (cached until the saved state changes)
+        session_bytes = get_session_bytes()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Get template name from metadata
@@ -901,6 +1321,13 @@ def render_build_mode():
                     st.rerun()
 
 
+def _sync_word_selection(img_idx: int, picker_key: str):
+    """Word picker callback: copy the picked indices into the image's selection set"""
+    selections = st.session_state.selections[img_idx]
+    selections.clear()
+    selections.update(st.session_state[picker_key])
+
+
 def render_field_and_image_selector():
     """Combined field and image selection interface"""
     col1, col2 = st.columns([2, 1])  # Swapped: image on left (2), field on right (1)
@@ -912,26 +1339,15 @@ def render_field_and_image_selector():
         # Region filter
         region = st.selectbox(
             "Region",
-            ["All", "USA", "France"],
-            index=["All", "USA", "France"].index(st.session_state.field_filter)
+            REGIONS,
+            index=_REGION_INDEX.get(st.session_state.field_filter, 0)
         )
         if region != st.session_state.field_filter:
             st.session_state.field_filter = region
             st.rerun()
 
         # Field dropdown
-        fields = get_filtered_fields(st.session_state.field_filter)
-        created_fields = [f for f in fields if f in st.session_state.zones]
-        available_fields = [f for f in fields if f not in st.session_state.zones]
-
-        options = []
-        if created_fields:
-            options.append("── Configured ──")
-            options.extend([f"✅ {f}" for f in created_fields])
-        if available_fields:
-            if created_fields:
-                options.append("── Available ──")
-            options.extend(available_fields)
+        options = build_field_options(st.session_state.field_filter, frozenset(st.session_state.zones))
 
         if options:
             field_selection = st.selectbox(
@@ -967,48 +1383,52 @@ def render_field_and_image_selector():
                 if auto_zone:
                     st.session_state[auto_zones_key] = auto_zone.copy()
 
-            # Y Range
-            y_min = st.number_input(
-                "Y Min",
-                min_value=0.0,
-                max_value=1.0,
-                value=float(zone_config['y_range'][0]),
-                step=0.01,
-                format="%.3f",
-                key=f"y_min_{st.session_state.current_field}"
-            )
-            y_max = st.number_input(
-                "Y Max",
-                min_value=0.0,
-                max_value=1.0,
-                value=float(zone_config['y_range'][1]),
-                step=0.01,
-                format="%.3f",
-                key=f"y_max_{st.session_state.current_field}"
-            )
+            # Edits are batched in a form: stepping a value no longer reruns the whole page
+            with st.form(f"zone_coords_{st.session_state.current_field}"):
+                # Y Range
+                y_min = st.number_input(
+                    "Y Min",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=float(zone_config['y_range'][0]),
+                    step=0.01,
+                    format="%.3f",
+                    key=f"y_min_{st.session_state.current_field}"
+                )
+                y_max = st.number_input(
+                    "Y Max",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=float(zone_config['y_range'][1]),
+                    step=0.01,
+                    format="%.3f",
+                    key=f"y_max_{st.session_state.current_field}"
+                )
 
-            # X Range
-            x_min = st.number_input(
-                "X Min",
-                min_value=0.0,
-                max_value=1.0,
-                value=float(zone_config.get('x_range', (0, 1))[0]),
-                step=0.01,
-                format="%.3f",
-                key=f"x_min_{st.session_state.current_field}"
-            )
-            x_max = st.number_input(
-                "X Max",
-                min_value=0.0,
-                max_value=1.0,
-                value=float(zone_config.get('x_range', (0, 1))[1]),
-                step=0.01,
-                format="%.3f",
-                key=f"x_max_{st.session_state.current_field}"
-            )
+                # X Range
+                x_min = st.number_input(
+                    "X Min",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=float(zone_config.get('x_range', (0, 1))[0]),
+                    step=0.01,
+                    format="%.3f",
+                    key=f"x_min_{st.session_state.current_field}"
+                )
+                x_max = st.number_input(
+                    "X Max",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=float(zone_config.get('x_range', (0, 1))[1]),
+                    step=0.01,
+                    format="%.3f",
+                    key=f"x_max_{st.session_state.current_field}"
+                )
+
+                coords_submitted = st.form_submit_button("✔️ Apply", use_container_width=True)
 
             # Update zone config if values changed
-            if (y_min, y_max) != zone_config['y_range'] or (x_min, x_max) != zone_config.get('x_range', (0, 1)):
+            if coords_submitted and ((y_min, y_max) != zone_config['y_range'] or (x_min, x_max) != zone_config.get('x_range', (0, 1))):
                 zone_config['y_range'] = (y_min, y_max)
                 zone_config['x_range'] = (x_min, x_max)
                 st.session_state.zones[st.session_state.current_field] = zone_config
@@ -1039,14 +1459,14 @@ def render_field_and_image_selector():
 
         st.markdown("---")
         # Progress
-        st.metric("Progress", f"{len(st.session_state.zones)}/{len(fields)} fields")
+        st.metric("Progress", f"{len(st.session_state.zones)}/{_FIELD_COUNTS[st.session_state.field_filter]} fields")
 
     with col1:  # Image section now on the left
         # Image viewer and word selection
         st.markdown("#### Image & Word Selection")
 
         # Image navigation
-        image_options = [f"{i+1}. {img['name'][:30]}" for i, img in enumerate(st.session_state.images)]
+        image_options = get_image_options()
 
         col_nav1, col_nav2 = st.columns([3, 1])
         with col_nav1:
@@ -1067,16 +1487,15 @@ def render_field_and_image_selector():
         current_img = st.session_state.images[st.session_state.current_image_idx]
         current_selections = st.session_state.selections[st.session_state.current_image_idx]
 
-        vis_img = draw_visualization(
-            current_img['image'],
-            current_img['words'],
+        # Image display with scale
+        image_scale = get_setting('display', 'image_scale', 1.0)
+        vis_img = get_visualization(
+            current_img,
             current_selections,
             st.session_state.zones,
-            st.session_state.current_field
+            st.session_state.current_field,
+            image_scale
         )
-
-        # Image display with scale
-        image_scale = get_setting('display', 'image_scale', 1.0)
         if image_scale < 1.0:
             col_width = int(12 * image_scale)
             col1, col2 = st.columns([col_width, 12 - col_width])
@@ -1103,30 +1522,39 @@ def render_field_and_image_selector():
         with col4:
             st.info(f"Selected: {len(current_selections)}")
 
-        # Word buttons
+        # Word picker - one multi-select pills widget instead of a button per word
         words = current_img['words']
-        cols_per_row = 10  # 10 numbers per line as requested
-        for row_start in range(0, len(words), cols_per_row):
-            row_end = min(row_start + cols_per_row, len(words))
-            cols = st.columns(cols_per_row)
-
-            for i in range(row_start, row_end):
-                col_idx = i - row_start
-                word = words[i]
-                is_selected = i in current_selections
-
-                with cols[col_idx]:
-                    if st.button(
-                        str(i+1),
-                        key=f"word_{st.session_state.current_image_idx}_{i}",
-                        type="primary" if is_selected else "secondary",
-                        help=f"'{word['text']}'"
-                    ):
-                        if is_selected:
-                            current_selections.remove(i)
-                        else:
-                            current_selections.add(i)
-                        st.rerun()
+        picker_key = f"word_pills_{st.session_state.current_image_idx}"
+        if set(st.session_state.get(picker_key) or ()) != current_selections:
+            # Selection changed outside the picker (tools above, zone save, session load)
+            st.session_state[picker_key] = sorted(current_selections)
+        st.pills(
+            "Words",
+            options=range(len(words)),
+            format_func=lambda i: f"{i + 1}: {words[i].get('text', '')}",  # Number matches the overlay
+            selection_mode="multi",
+            key=picker_key,
+            on_change=_sync_word_selection,
+            args=(st.session_state.current_image_idx, picker_key),
+            label_visibility="collapsed"
+        )
+
+
+# Pipeline step blocks for render_custom_pattern_tester
+_STEP_HTML_CHANGE = """
+        <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {color}15, transparent); border-left: 3px solid {color}; border-radius: 4px;">
+            <span style="color: {color}; font-weight: bold; font-size: 14px;">{label}:</span>
+            <span style="color: #666; margin-left: 10px; font-family: monospace;">{before}</span>
+            <span style="color: #999; margin: 0 5px;">→</span>
+            <span style="color: #333; font-weight: 500; font-family: monospace;">{after}</span>
+        </div>
+        """
+_STEP_HTML_PLAIN = """
+        <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {color}15, transparent); border-left: 3px solid {color}; border-radius: 4px;">
+            <span style="color: {color}; font-weight: bold; font-size: 14px;">{label}:</span>
+            <span style="color: #333; margin-left: 10px; font-family: monospace;{weight}">{text}</span>
+        </div>
+        """
 
 
 def render_custom_pattern_tester(zone_config: dict, field_name: str = None):
@@ -1191,199 +1619,143 @@ def render_custom_pattern_tester(zone_config: dict, field_name: str = None):
 
         st.divider()
 
-        # Process the text step by step
+        # Process the text step by step - blocks are collected and sent as one markdown element
         current_text = custom_text
         model_colors = {'input': '#6c757d', 'consensus': '#9C27B0', 'cleanup': '#2196F3', 'normalize': '#FF9800', 'valid': '#4CAF50', 'invalid': '#F44336'}
+        steps_html = []
+        pattern_errors = []
 
         # Show original input
-        st.markdown(f"""
-        <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['input']}15, transparent); border-left: 3px solid {model_colors['input']}; border-radius: 4px;">
-            <span style="color: {model_colors['input']}; font-weight: bold; font-size: 14px;">📥 INPUT:</span>
-            <span style="color: #333; margin-left: 10px; font-family: monospace;">{custom_text}</span>
-        </div>
-        """, unsafe_allow_html=True)
+        steps_html.append(_STEP_HTML_PLAIN.format(
+            color=model_colors['input'], label="📥 INPUT", text=custom_text, weight=""))
 
         # Step 1: Consensus Extract
         if apply_consensus and consensus_pattern.strip():
             try:
-                match = re.search(consensus_pattern, current_text, re.IGNORECASE | re.MULTILINE)
+                match = _compile(consensus_pattern, re.IGNORECASE | re.MULTILINE).search(current_text)
                 if match:
                     prev_text = current_text
                     current_text = match.group(1).strip() if (match.lastindex and match.lastindex >= 1) else match.group(0).strip()
-
-                    st.markdown(f"""
-                    <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['consensus']}15, transparent); border-left: 3px solid {model_colors['consensus']}; border-radius: 4px;">
-                        <span style="color: {model_colors['consensus']}; font-weight: bold; font-size: 14px;">✅ CONSENSUS EXTRACT:</span>
-                        <span style="color: #666; margin-left: 10px; font-family: monospace;">{prev_text}</span>
-                        <span style="color: #999; margin: 0 5px;">→</span>
-                        <span style="color: #333; font-weight: 500; font-family: monospace;">{current_text}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    steps_html.append(_STEP_HTML_CHANGE.format(
+                        color=model_colors['consensus'], label="✅ CONSENSUS EXTRACT", before=prev_text, after=current_text))
                 else:
-                    st.markdown(f"""
-                    <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['invalid']}15, transparent); border-left: 3px solid {model_colors['invalid']}; border-radius: 4px;">
-                        <span style="color: {model_colors['invalid']}; font-weight: bold; font-size: 14px;">❌ CONSENSUS EXTRACT:</span>
-                        <span style="color: #333; margin-left: 10px; font-family: monospace;">No match</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    steps_html.append(_STEP_HTML_PLAIN.format(
+                        color=model_colors['invalid'], label="❌ CONSENSUS EXTRACT", text="No match", weight=""))
                     current_text = ""
             except re.error as e:
-                st.error(f"❌ Consensus pattern error: {e}")
+                pattern_errors.append(f"❌ Consensus pattern error: {e}")
                 current_text = ""
 
         # Step 2: Cleanup
         if apply_cleanup and cleanup_pattern.strip() and current_text:
             try:
                 prev_text = current_text
-                current_text = re.sub(cleanup_pattern, '', current_text, flags=re.IGNORECASE).strip()
+                current_text = _compile(cleanup_pattern, re.IGNORECASE).sub('', current_text).strip()
 
                 if prev_text != current_text:
-                    st.markdown(f"""
-                    <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['cleanup']}15, transparent); border-left: 3px solid {model_colors['cleanup']}; border-radius: 4px;">
-                        <span style="color: {model_colors['cleanup']}; font-weight: bold; font-size: 14px;">✅ CLEANUP:</span>
-                        <span style="color: #666; margin-left: 10px; font-family: monospace;">{prev_text}</span>
-                        <span style="color: #999; margin: 0 5px;">→</span>
-                        <span style="color: #333; font-weight: 500; font-family: monospace;">{current_text if current_text else '(empty)'}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    steps_html.append(_STEP_HTML_CHANGE.format(
+                        color=model_colors['cleanup'], label="✅ CLEANUP", before=prev_text,
+                        after=current_text if current_text else '(empty)'))
                 else:
-                    st.markdown(f"""
-                    <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['cleanup']}15, transparent); border-left: 3px solid {model_colors['cleanup']}; border-radius: 4px;">
-                        <span style="color: {model_colors['cleanup']}; font-weight: bold; font-size: 14px;">ℹ️ CLEANUP:</span>
-                        <span style="color: #333; margin-left: 10px; font-family: monospace;">No changes</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    steps_html.append(_STEP_HTML_PLAIN.format(
+                        color=model_colors['cleanup'], label="ℹ️ CLEANUP", text="No changes", weight=""))
             except re.error as e:
-                st.error(f"❌ Cleanup pattern error: {e}")
+                pattern_errors.append(f"❌ Cleanup pattern error: {e}")
 
         # Step 3: Normalization (always apply if we have text)
         if current_text:
-            field_format = zone_config.get('format', 'string')
-            format_options = {}
-
-            if field_format == 'date':
-                format_options['date_format'] = zone_config.get('date_format', 'MM.DD.YYYY')
-            elif field_format == 'height':
-                format_options['height_format'] = zone_config.get('height_format', 'auto')
-            elif field_format == 'weight':
-                format_options['weight_format'] = zone_config.get('weight_format', 'auto')
+            field_format, format_options = _fmt_opts(zone_config)
 
             prev_text = current_text
-            normalized = normalize_field(current_text, field_format, field_name, **format_options)
+            normalized = _norm_cached(current_text, field_format, field_name, tuple(sorted(format_options.items())))
 
             if normalized and normalized != current_text:
                 current_text = normalized
-                st.markdown(f"""
-                <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['normalize']}15, transparent); border-left: 3px solid {model_colors['normalize']}; border-radius: 4px;">
-                    <span style="color: {model_colors['normalize']}; font-weight: bold; font-size: 14px;">✅ NORMALIZE ({field_format}):</span>
-                    <span style="color: #666; margin-left: 10px; font-family: monospace;">{prev_text}</span>
-                    <span style="color: #999; margin: 0 5px;">→</span>
-                    <span style="color: #333; font-weight: 500; font-family: monospace;">{current_text}</span>
-                </div>
-                """, unsafe_allow_html=True)
+                steps_html.append(_STEP_HTML_CHANGE.format(
+                    color=model_colors['normalize'], label=f"✅ NORMALIZE ({field_format})", before=prev_text, after=current_text))
 
         # Step 4: Validation
         if current_text:
             if apply_validation and validation_pattern.strip():
                 try:
-                    is_valid = bool(re.match(validation_pattern, current_text))
+                    is_valid = bool(_compile(validation_pattern).match(current_text))
                     color = model_colors['valid'] if is_valid else model_colors['invalid']
                     status = "✅ VALID" if is_valid else "❌ INVALID"
-
-                    st.markdown(f"""
-                    <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {color}15, transparent); border-left: 3px solid {color}; border-radius: 4px;">
-                        <span style="color: {color}; font-weight: bold; font-size: 14px;">{status}:</span>
-                        <span style="color: #333; margin-left: 10px; font-family: monospace; font-weight: 600;">{current_text}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    steps_html.append(_STEP_HTML_PLAIN.format(
+                        color=color, label=status, text=current_text, weight=" font-weight: 600;"))
                 except re.error as e:
-                    st.error(f"❌ Validation pattern error: {e}")
+                    pattern_errors.append(f"❌ Validation pattern error: {e}")
             else:
                 # No validation or not enabled - show final result
-                st.markdown(f"""
-                <div style="margin: 8px 0; padding: 8px; background: linear-gradient(90deg, {model_colors['valid']}15, transparent); border-left: 3px solid {model_colors['valid']}; border-radius: 4px;">
-                    <span style="color: {model_colors['valid']}; font-weight: bold; font-size: 14px;">✅ RESULT:</span>
-                    <span style="color: #333; margin-left: 10px; font-family: monospace; font-weight: 600;">{current_text}</span>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
+                steps_html.append(_STEP_HTML_PLAIN.format(
+                    color=model_colors['valid'], label="✅ RESULT", text=current_text, weight=" font-weight: 600;"))
+
+        st.markdown(''.join(steps_html), unsafe_allow_html=True)
+        for message in pattern_errors:
+            st.error(message)
+
+        if not current_text:
             st.warning("⚠️ Empty result - no output from extraction pipeline")
 
 
 def render_zone_extraction_section(zone_config, field_name: str = None):
     """Zone-based extraction preview with detailed expandables"""
 
+    # Extract once per image - results feed both the copy-all block and the per-image previews
+    per_image_results = [get_zone_model_texts(img_data, zone_config) for img_data in st.session_state.images]
+
     # Copy all raw outputs button
-    all_raw_outputs = []
-    for img_data in st.session_state.images:
-        model_results = extract_from_zone_multimodel(
-            img_data.get('ocr_result', {}),
-            zone_config,
-            img_data.get('words', [])
-        )
-        if model_results:
-            all_raw_outputs.extend(model_results.values())
+    all_raw_outputs = [text for model_results in per_image_results for text in model_results.values()]
 
     if all_raw_outputs:
         with st.expander(f"📋 Copy All Zone Outputs ({len(all_raw_outputs)} samples)", expanded=False):
             st.code('\n'.join(all_raw_outputs), language="text")
 
-    # Preview for each image with expandable details
-    for img_idx, img_data in enumerate(st.session_state.images):
-        model_results_raw = extract_from_zone_multimodel(
-            img_data.get('ocr_result', {}), zone_config, img_data.get('words', [])
-        )
+    # Compile validation pattern once for all images
+    pattern = zone_config.get('pattern', '')
+    validation_re = _preview_validation_re(pattern)
 
-        # Prepare normalization settings
-        field_format = zone_config.get('format', 'string')
-        format_options = {}
-        if field_format == 'date':
-            format_options['date_format'] = zone_config.get('date_format', 'MM.DD.YYYY')
-        elif field_format == 'height':
-            format_options['height_format'] = zone_config.get('height_format', 'auto')
-        elif field_format == 'weight':
-            format_options['weight_format'] = zone_config.get('weight_format', 'auto')
+    # Normalization settings depend only on the zone
+    field_format, format_options = _fmt_opts(zone_config)
+    opts_items = tuple(sorted(format_options.items()))
 
-        pattern = zone_config.get('pattern', '')
+    # Vote results only change with the zone config, so reuse them across reruns
+    preview_key = (field_name, _zone_key(zone_config))
+
+    # Preview for each image with expandable details
+    for img_idx, (img_data, model_results_raw) in enumerate(zip(st.session_state.images, per_image_results)):
+        preview_cache = img_data.setdefault('preview_cache', {})
+        cached = preview_cache.get(preview_key)
+        model_results_normalized = None
 
         # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
-        if model_results_raw:
-            # Step 1: Normalize each model's result
-            model_results_normalized = {}
-            for model_key, raw_value in model_results_raw.items():
-                normalized_value = normalize_field(raw_value, field_format, field_name, **format_options) if raw_value else None
-                if normalized_value:
-                    model_results_normalized[model_key] = normalized_value
-
-            # Step 2: Vote on normalized values using character-level voting
-            if model_results_normalized:
-                from zone_builder.zone_operations import get_consensus_from_models
-                normalized_text, vote_count, total_models = get_consensus_from_models(
-                    model_results_normalized,
-                    field_name,
-                    zone_config.get('tie_break_prefer')
-                )
-                consensus_text = normalized_text  # For display purposes
-            else:
-                consensus_text = None
-                normalized_text = None
-                vote_count, total_models = 0, len(model_results_raw)
+        if cached is not None:
+            consensus_text, normalized_text, is_valid, vote_count, total_models = cached
+        elif model_results_raw:
+            model_results_normalized, normalized_text, vote_count, total_models = _normalize_and_vote(
+                model_results_raw, field_format, field_name, opts_items, zone_config.get('tie_break_prefer')
+            )
+            consensus_text = normalized_text  # For display purposes
 
             # Validate against pattern
-            is_valid = bool(normalized_text) and (not pattern or bool(re.match(pattern, normalized_text)))
+            is_valid = bool(normalized_text) and (validation_re is None or bool(validation_re.match(normalized_text)))
         else:
             # Fallback to single model
-            consensus_text = extract_from_zone(img_data['words'], zone_config)
+            consensus_text = extract_from_zone(img_data['words'], zone_config, get_word_bbox(img_data))
             _, normalized_text, is_valid, _, _ = process_extraction_result(
                 consensus_text, zone_config, field_name
             )
             vote_count, total_models = 1, 1
 
+        if cached is None:
+            _cache_put(preview_cache, preview_key,
+                       (consensus_text, normalized_text, is_valid, vote_count, total_models))
+
         # Render expandable for this image
         render_per_image_expandable(
             img_idx, img_data, consensus_text, normalized_text, is_valid,
             vote_count, total_models, model_results_raw, field_format, format_options,
-            pattern, field_name
+            pattern, field_name, prenormalized=model_results_normalized
         )
 
 
@@ -1401,15 +1773,14 @@ def render_pattern_extraction_section(zone_config, field_name: str = None):
     # Get consensus pattern from zone_config (set in Common Patterns section above)
     consensus_pattern = zone_config.get('consensus_extract', '')
 
-    # Validate consensus pattern and show info
+    # Validate consensus pattern and show info (one cached compile serves both checks)
     if consensus_pattern:
-        from zone_builder.zone_operations import validate_consensus_pattern
-        is_valid, error_msg = validate_consensus_pattern(consensus_pattern)
-        if not is_valid:
-            st.error(f"⚠️ **Invalid Pattern:** {error_msg}")
+        try:
+            compiled = _compile(consensus_pattern)
+        except re.error as e:
+            st.error(f"⚠️ **Invalid Pattern:** Invalid regex: {e}")
         else:
             # Check if pattern has capturing group
-            compiled = re.compile(consensus_pattern)
             if compiled.groups >= 1:
                 st.success("✓ Pattern with capturing group - extracts group(1)")
             else:
@@ -1456,66 +1827,38 @@ def render_pattern_extraction_section(zone_config, field_name: str = None):
         # NO PATTERN: Show expanded zone outputs for pattern development
         st.info("💡 Enter a 'Consensus Extract' pattern in the Common Patterns section above to test extraction. The outputs below show the expanded zone (+5%) text from each model to help you develop your pattern.")
 
-        all_expanded_outputs = []
-        for img_data in st.session_state.images:
-            model_results = extract_from_zone_multimodel(
-                img_data.get('ocr_result', {}),
-                expanded_zone_config,
-                img_data.get('words', [])
-            )
-            if model_results:
-                all_expanded_outputs.extend(model_results.values())
+        # Extract once per image - results feed both the copy-all block and the per-image previews
+        per_image_results = [get_zone_model_texts(img_data, expanded_zone_config) for img_data in st.session_state.images]
+        all_expanded_outputs = [text for model_results in per_image_results for text in model_results.values()]
 
         if all_expanded_outputs:
             with st.expander(f"📋 Copy All Expanded Zone Outputs ({len(all_expanded_outputs)} samples)", expanded=False):
                 st.code('\n'.join(all_expanded_outputs), language="text")
 
-        # Per-image expandables showing expanded zone content
-        for img_idx, img_data in enumerate(st.session_state.images):
-            model_results_raw = extract_from_zone_multimodel(
-                img_data.get('ocr_result', {}), expanded_zone_config, img_data.get('words', [])
-            )
+        # Compile validation pattern once for all images
+        pattern = zone_config.get('pattern', '')
+        validation_re = _preview_validation_re(pattern)
 
-            # Prepare normalization settings
-            field_format = zone_config.get('format', 'string')
-            format_options = {}
-            if field_format == 'date':
-                format_options['date_format'] = zone_config.get('date_format', 'MM.DD.YYYY')
-            elif field_format == 'height':
-                format_options['height_format'] = zone_config.get('height_format', 'auto')
-            elif field_format == 'weight':
-                format_options['weight_format'] = zone_config.get('weight_format', 'auto')
+        # Normalization settings depend only on the zone
+        field_format, format_options = _fmt_opts(zone_config)
+        opts_items = tuple(sorted(format_options.items()))
 
-            pattern = zone_config.get('pattern', '')
+        # Per-image expandables showing expanded zone content
+        for img_idx, (img_data, model_results_raw) in enumerate(zip(st.session_state.images, per_image_results)):
+            model_results_normalized = None
 
             # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
             if model_results_raw:
-                # Step 1: Normalize each model's result
-                model_results_normalized = {}
-                for model_key, raw_value in model_results_raw.items():
-                    normalized_value = normalize_field(raw_value, field_format, field_name, **format_options) if raw_value else None
-                    if normalized_value:
-                        model_results_normalized[model_key] = normalized_value
-
-                # Step 2: Vote on normalized values using character-level voting
-                if model_results_normalized:
-                    from zone_builder.zone_operations import get_consensus_from_models
-                    normalized_text, vote_count, total_models = get_consensus_from_models(
-                        model_results_normalized,
-                        field_name,
-                        zone_config.get('tie_break_prefer')
-                    )
-                    consensus_text = normalized_text  # For display purposes
-                else:
-                    consensus_text = None
-                    normalized_text = None
-                    vote_count, total_models = 0, len(model_results_raw)
+                model_results_normalized, normalized_text, vote_count, total_models = _normalize_and_vote(
+                    model_results_raw, field_format, field_name, opts_items, zone_config.get('tie_break_prefer')
+                )
+                consensus_text = normalized_text  # For display purposes
 
                 # Validate against pattern
-                is_valid = bool(normalized_text) and (not pattern or bool(re.match(pattern, normalized_text)))
+                is_valid = bool(normalized_text) and (validation_re is None or bool(validation_re.match(normalized_text)))
             else:
                 # Fallback to single model
-                consensus_text = extract_from_zone(img_data['words'], expanded_zone_config)
+                consensus_text = extract_from_zone(img_data['words'], expanded_zone_config, get_word_bbox(img_data))
                 _, normalized_text, is_valid, _, _ = process_extraction_result(
                     consensus_text, zone_config, field_name
                 )
@@ -1525,151 +1868,95 @@ def render_pattern_extraction_section(zone_config, field_name: str = None):
             render_per_image_expandable(
                 img_idx, img_data, consensus_text, normalized_text, is_valid,
                 vote_count, total_models, model_results_raw, field_format, format_options,
-                pattern, field_name
+                pattern, field_name, section="expanded", prenormalized=model_results_normalized
             )
     else:
         # PATTERN ENTERED: Test pattern and show results
         try:
-            compiled_pattern = re.compile(consensus_pattern, re.IGNORECASE | re.MULTILINE)
+            compiled_pattern = _compile(consensus_pattern, re.IGNORECASE | re.MULTILINE)
         except re.error as e:
             st.error(f"❌ Invalid regex: {e}")
             return
 
         st.success(f"✅ Testing pattern on each model's expanded zone (+5%) and full document")
 
-        # Get cleanup pattern if toggle is enabled
+        # Get cleanup pattern if toggle is enabled, compiled once for all images/models
         cleanup_pattern = zone_config.get('cleanup_pattern', '') if apply_cleanup else ''
+        cleanup_re = _safe_compile(cleanup_pattern, re.IGNORECASE) if cleanup_pattern else None  # Invalid pattern: skip cleanup
 
-        # Helper function to test pattern, apply clustering, then cleanup
-        def test_pattern_on_text(zone_text, full_text, zone_words):
-            """
-            Test pattern on zone text, apply clustering to matched words, then cleanup
-
-            Flow:
-            1. Apply pattern to zone_text → extract rough value
-            2. Find words that make up this value (by token matching)
-            3. Apply clustering to those words → filter to best cluster
-            4. Rebuild text from clustered words
-            5. Apply cleanup
-            """
-            extracted_value = None
+        # Pattern matches keyed by zone text - models usually agree on the zone text,
+        # so each distinct text is searched once per pass instead of once per model
+        zone_matches = {}
 
-            # Step 1: Apply consensus_extract pattern to zone text (NOT clustered yet)
-            if zone_text:
-                match = compiled_pattern.search(zone_text)
-                if match:
-                    # Extract value: use group(1) if capturing group exists, else group(0)
-                    extracted_value = match.group(1) if match.groups() else match.group(0)
-
-            if not extracted_value:
-                return None
-
-            # Step 2: Apply clustering (if configured) to ALL zone words
-            # Pattern validates the zone has relevant data, clustering selects best cluster (e.g., highest line)
-            if zone_config.get('cluster_by') and zone_words:
-                from zone_builder.zone_operations import apply_clustering
-                clustered_words = apply_clustering(zone_words, zone_config)
-                if clustered_words:
-                    # Rebuild text from clustered words
-                    extracted_value = ' '.join(w.get('text', '') for w in clustered_words)
-                # If clustering removed all words, keep original extracted_value
-
-            # Step 3: Apply cleanup pattern (if enabled and pattern exists)
-            if extracted_value and cleanup_pattern:
-                try:
-                    extracted_value = re.sub(cleanup_pattern, '', extracted_value, flags=re.IGNORECASE).strip()
-                except re.error:
-                    pass  # If cleanup pattern is invalid, skip it
+        # Normalization and validation settings depend only on the zone
+        field_format, format_options = _fmt_opts(zone_config)
+        opts_items = tuple(sorted(format_options.items()))
+        pattern = zone_config.get('pattern', '')
+        validation_re = _preview_validation_re(pattern)  # Invalid pattern: warn and skip validation
+
+        # Tight-zone config without clustering/cleanup - clustering is applied after the pattern matches
+        original_zone_config_unclustered = zone_config.copy()
+        original_zone_config_unclustered['cleanup_pattern'] = ''  # No cleanup yet
+        original_zone_config_unclustered.pop('cluster_by', None)  # Don't cluster yet
+        original_zone_config_unclustered.pop('cluster_select', None)
+        original_zone_config_unclustered.pop('cluster_tolerance', None)
 
-            return extracted_value
+        # Pattern results only change with the zone config and the cleanup toggle, so reuse them across reruns
+        preview_key = (field_name, 'pattern', _zone_key(zone_config), apply_cleanup)
 
         # Process all images once and cache results
         all_image_results = []
 
         for img_idx, img_data in enumerate(st.session_state.images):
-            ocr_result = img_data.get('ocr_result', {})
-            per_model_outputs = ocr_result.get('model_comparison', {}).get('per_model_outputs', {})
-
-            # Get expanded zone text for pattern matching
-            from zone_builder.zone_operations import extract_from_zone_multimodel_with_words
-            model_expanded_zone_results_with_words = extract_from_zone_multimodel_with_words(
-                ocr_result, expanded_zone_config, img_data.get('words', [])
-            )
-
-            # Get ORIGINAL zone words for clustering (tight zone, not expanded)
-            # Remove clustering from config so we get unclustered words
-            original_zone_config_unclustered = zone_config.copy()
-            original_zone_config_unclustered['cleanup_pattern'] = ''  # No cleanup yet
-            original_zone_config_unclustered.pop('cluster_by', None)  # Don't cluster yet
-            original_zone_config_unclustered.pop('cluster_select', None)
-            original_zone_config_unclustered.pop('cluster_tolerance', None)
-            model_original_zone_results_with_words = extract_from_zone_multimodel_with_words(
-                ocr_result, original_zone_config_unclustered, img_data.get('words', [])
-            )
-
-            # Test pattern on each model - Get model names dynamically from the data
-            model_results = {}
+            preview_cache = img_data.setdefault('preview_cache', {})
+            cached = preview_cache.get(preview_key)
 
-            # Get actual model names from per_model_outputs (don't hardcode!)
-            available_models = list(per_model_outputs.keys()) if per_model_outputs else []
+            if cached is None:
+                ocr_result = img_data.get('ocr_result', {})
+                per_model_outputs = ocr_result.get('model_comparison', {}).get('per_model_outputs', {})
 
-            for model_name in available_models:
                 # Get expanded zone text for pattern matching
-                expanded_zone_text, _ = model_expanded_zone_results_with_words.get(model_name, ('', []))
-                # Get original zone words for clustering
-                _, original_zone_words = model_original_zone_results_with_words.get(model_name, ('', []))
+                model_expanded_zone_results_with_words = get_zone_extraction(img_data, expanded_zone_config)
 
-                model_data = per_model_outputs.get(model_name, {})
+                # Get ORIGINAL zone words for clustering (tight zone, not expanded)
+                model_original_zone_results_with_words = get_zone_extraction(img_data, original_zone_config_unclustered)
 
-                # Get full document text by joining all words
-                model_words = model_data.get('words', []) if model_data else []
-                full_text = ' '.join(model_words) if model_words else ''
+                # Test pattern on each model - Get model names dynamically from the data
+                model_results = {}
 
-                model_match = test_pattern_on_text(expanded_zone_text, full_text, original_zone_words)
-                model_results[model_name] = model_match if model_match else ''
+                # Get actual model names from per_model_outputs (don't hardcode!)
+                available_models = list(per_model_outputs.keys()) if per_model_outputs else []
 
-            # Normalize and validate each model's result BEFORE voting
-            field_format = zone_config.get('format', 'string')
-            format_options = {}
-            if field_format == 'date':
-                format_options['date_format'] = zone_config.get('date_format', 'MM.DD.YYYY')
-            elif field_format == 'height':
-                format_options['height_format'] = zone_config.get('height_format', 'auto')
-            elif field_format == 'weight':
-                format_options['weight_format'] = zone_config.get('weight_format', 'auto')
+                for model_name in available_models:
+                    # Get expanded zone text for pattern matching
+                    expanded_zone_text, _ = model_expanded_zone_results_with_words.get(model_name, ('', []))
+                    # Get original zone words for clustering
+                    _, original_zone_words = model_original_zone_results_with_words.get(model_name, ('', []))
 
-            pattern = zone_config.get('pattern', '')
+                    model_match = _test_pattern_on_text(expanded_zone_text, original_zone_words,
+                                                       compiled_pattern, cleanup_re, zone_config, zone_matches)
+                    model_results[model_name] = model_match if model_match else ''
 
-            # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
-            if model_results:
-                # Step 1: Normalize each model's result
-                model_results_normalized = {}
-                for model_key, raw_value in model_results.items():
-                    normalized_value = normalize_field(raw_value, field_format, field_name, **format_options) if raw_value else None
-                    if normalized_value:
-                        model_results_normalized[model_key] = normalized_value
-
-                # Step 2: Vote on normalized values using character-level voting
-                if model_results_normalized:
-                    from zone_builder.zone_operations import get_consensus_from_models
-                    consensus_match, vote_count, total_models = get_consensus_from_models(
-                        model_results_normalized,
-                        field_name,
-                        zone_config.get('tie_break_prefer')
+                # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
+                model_results_normalized = None
+                if model_results:
+                    model_results_normalized, consensus_match, vote_count, total_models = _normalize_and_vote(
+                        model_results, field_format, field_name, opts_items, zone_config.get('tie_break_prefer')
                     )
-                    consensus_text = consensus_match  # For display purposes
                 else:
-                    consensus_match, vote_count, total_models = None, 0, len(model_results)
-                    consensus_text = None
-            else:
-                consensus_match, vote_count, total_models = None, 0, 0
-                consensus_text = None
+                    consensus_match, vote_count, total_models = None, 0, 0
+
+                cached = (model_results, model_results_normalized, consensus_match, vote_count, total_models)
+                _cache_put(preview_cache, preview_key, cached)
+
+            model_results, model_results_normalized, consensus_match, vote_count, total_models = cached
 
             # Store results for this image - use NORMALIZED results for display
             all_image_results.append({
                 'img_idx': img_idx,
                 'img_data': img_data,
                 'model_results': model_results,
+                'model_results_normalized': model_results_normalized,
                 'consensus_match': consensus_match,
                 'vote_count': vote_count,
                 'total_models': total_models
@@ -1687,58 +1974,37 @@ def render_pattern_extraction_section(zone_config, field_name: str = None):
 
         # Per-image expandables using cached results
         for img_result in all_image_results:
-            # Process result: normalize, validate
-            cleaned, normalized, is_valid, field_format, format_options = process_extraction_result(
-                img_result['consensus_match'] or '', zone_config, field_name
-            )
+            # Normalize and validate with the zone settings resolved above
+            cleaned = img_result['consensus_match'] or ''
+            normalized = _norm_cached(cleaned, field_format, field_name, opts_items) if cleaned else None
+            is_valid = bool(normalized) and (validation_re is None or bool(validation_re.match(normalized)))
 
             # Render expandable for this image
             render_per_image_expandable(
                 img_result['img_idx'], img_result['img_data'], cleaned, normalized, is_valid,
                 img_result['vote_count'], img_result['total_models'], img_result['model_results'],
-                field_format, format_options, zone_config.get('pattern', ''), field_name, empty_msg='(no match)'
+                field_format, format_options, pattern, field_name, empty_msg='(no match)',
+                section="pattern", prenormalized=img_result['model_results_normalized']
             )
 
 
-def render_test_mode():
-    """Test mode for validation"""
-    st.markdown("### 🧪 Zone Testing & Validation")
+_WELCOME_MD = """
+### 👋 Welcome to Zone Builder Pro
 
-    if not st.session_state.zones:
-        st.info("No zones created yet. Switch to Build mode to create zones.")
-        return
-
-    # Test all zones
-    for field_name, zone_config in st.session_state.zones.items():
-        success_count = 0
-        total_count = len(st.session_state.images)
-
-        for img_data in st.session_state.images:
-            # Test zone extraction
-            extracted = extract_from_zone(img_data['words'], zone_config)
-            if extracted:
-                success_count += 1
-
-        success_rate = (success_count / total_count * 100) if total_count > 0 else 0
-        status = "🟢" if success_rate >= 90 else "🟡" if success_rate >= 70 else "🔴"
+**Getting Started:**
+1. Upload document images in the sidebar
+2. Process with OCR
+3. Select field and create zones
+4. Configure extraction patterns
+5. Export your template
 
-        st.text(f"{status} {field_name}: {success_rate:.0f}% success ({success_count}/{total_count})")
+**Upload images in the sidebar to begin →**
+"""
 
 
 def render_welcome_screen():
     """Welcome screen"""
-    st.markdown("""
-    ### 👋 Welcome to Zone Builder Pro
-
-    **Getting Started:**
-    1. Upload document images in the sidebar
-    2. Process with OCR
-    3. Select field and create zones
-    4. Configure extraction patterns
-    5. Export your template
-
-    **Upload images in the sidebar to begin →**
-    """)
+    st.markdown(_WELCOME_MD)
 
 
 def render_test_mode():
@@ -1782,6 +2048,19 @@ def render_test_mode():
         render_test_results()
 
 
+def get_export_code(metadata: dict) -> str:
+    """export_to_python output, regenerated only when the zones or metadata change"""
+    state = st.session_state
+    export_key = _zone_key({'zones': state.zones, 'metadata': metadata})
+    cached = state.get('export_code_cache')
+    if cached and cached[0] == export_key:
+        return cached[1]
+
+    python_code = export_to_python(state.zones, metadata)
+    state.export_code_cache = (export_key, python_code)
+    return python_code
+
+
 def render_export_mode():
     """Export mode - template export interface"""
     st.markdown("### 📤 Export Template")
@@ -1842,7 +2121,7 @@ def render_export_mode():
     # Export section
     st.markdown("#### 💾 Export Template")
 
-    python_code = export_to_python(st.session_state.zones, metadata)
+    python_code = get_export_code(metadata)
     st.code(python_code, language="python", line_numbers=True)
 
     st.download_button(
@@ -1854,250 +2133,349 @@ def render_export_mode():
     )
 
 
-def process_test_images_and_extract(test_files, api_url):
-    """Process test images and extract all fields using configured zones"""
-    st.session_state.test_results = []
+def _consensus_display(raw_consensus: str, normalized: str) -> str:
+    """Consensus text for the test results view, with arrow notation like Build Mode"""
+    if normalized != raw_consensus and normalized:
+        return f"{raw_consensus or '(empty)'} → {normalized}"
+    return raw_consensus or "(empty)"
+
+
+def _model_display_rows(model_results: dict, model_results_normalized: dict, raw_consensus: str) -> list:
+    """(is_winner, model_upper, display) per model for the test results view"""
+    rows = []
+    for model_name, model_text in model_results.items():
+        # Normalized while voting (models that normalize to nothing are absent)
+        model_normalized = model_results_normalized.get(model_name)
+
+        # Show arrow notation if normalized differs from raw (like Build Mode)
+        if model_text and model_text != model_normalized and model_normalized:
+            display = f"{model_text} → {model_normalized}"
+        else:
+            display = model_text or '(empty)'
+        # Escaped here, once, since the rows are rendered as raw HTML
+        rows.append((model_text == raw_consensus, html.escape(model_name.upper()), html.escape(display)))
+    return rows
+
+
+# One per-model row in the test results view (filled with str.format, styled by the zb-row page CSS)
+_TEST_MODEL_ROW_HTML = (
+    '<div class="zb-row {row_class}"><span class="zb-tag">{status} {model_upper}:</span>'
+    '<span class="zb-val">{display}</span></div>'
+)
+
+
+def _render_test_model_rows(field_result: dict, method: str):
+    """
+    Per-model result rows for one extraction method ('zone' or 'pattern'), sent as a single markdown element
+
+    The joined HTML is kept on the field result, so re-showing the rows only resends it.
+    """
+    html_key = f'{method}_model_rows_html'
+    if html_key not in field_result:
+        rows = field_result[f'{method}_model_rows']
+        if all(is_winner for is_winner, _, _ in rows):
+            # Every model read the consensus - one line says it all
+            field_result[html_key] = f"✅ All {len(rows)} models agree"
+        else:
+            field_result[html_key] = ''.join(
+                _TEST_MODEL_ROW_HTML.format(
+                    row_class="zb-row-win" if is_winner else "zb-row-mute",
+                    status="🏆" if is_winner else "📝",
+                    model_upper=model_upper,
+                    display=display,
+                )
+                for is_winner, model_upper, display in rows
+            )
+    st.markdown(field_result[html_key], unsafe_allow_html=True)
+
+
+_TEST_THUMB_WIDTH = 200  # Width of the test result thumbnails (the only size they are shown at)
+
+
+def _test_thumbnail(img_bytes: bytes) -> bytes:
+    """Small JPEG of a test image - the results view never needs the full resolution"""
+    img = Image.open(io.BytesIO(img_bytes))
+    img.thumbnail((_TEST_THUMB_WIDTH, img.height))
+    buf = io.BytesIO()
+    img.convert('RGB').save(buf, 'JPEG', quality=85)
+    return buf.getvalue()
+
+
+def _thumbnail_and_ocr(img_bytes: bytes, filename: str, api_url: str) -> tuple:
+    """Worker job for one test image: decode it to a thumbnail, then OCR it"""
+    thumbnail = _test_thumbnail(img_bytes)  # Unreadable images fail here, before an OCR request is spent
+    return thumbnail, get_ocr_result(img_bytes, filename, api_url)
+
+
+def _extract_test_image(image_name: str, thumbnail: bytes, ocr_result: dict, field_prep: dict) -> dict:
+    """
+    Extract every configured field from one OCR'd test image, zone-based and pattern-based
+
+    field_prep holds each field's configs, format options and compiled regexes,
+    prepared once per test run by process_test_images_and_extract.
+    """
+    words = extract_words(ocr_result)
+    word_bbox = word_bbox_array(words)  # Shared by every field's zone filter
+    words_with_geom = ocr_words_with_geom(ocr_result)  # Shared by every field's per-model matching
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    # Extract all configured fields
+    field_results = {}
+    overall_valid = True
+    valid_fields = 0
+    zone_valid_fields = 0
+    pattern_fields = 0
+    pattern_valid_fields = 0
     
-    for idx, file in enumerate(test_files):
-        status_text.text(f"Processing {file.name} ({idx + 1}/{len(test_files)})...")
+    for field_name, prep in field_prep.items():
+        working_zone_config = prep['working']
+        zone_config_pure = prep['pure']
+        field_format, format_options, opts_items = prep['field_format'], prep['format_options'], prep['opts_items']
+        validation_re, consensus_re, cleanup_re = prep['validation_re'], prep['consensus_re'], prep['cleanup_re']
         
-        try:
-            img_bytes = file.getvalue()
-            img = Image.open(io.BytesIO(img_bytes))
+        # TEST BOTH EXTRACTION METHODS SEPARATELY
+        
+        # 1. ZONE-BASED EXTRACTION (pure zone, no pattern fallback)
+        zone_model_results = extract_from_zone_multimodel(
+            ocr_result,
+            zone_config_pure,
+            words,
+            word_bbox,
+            words_with_geom
+        )
+        
+        # Normalize and validate EACH model's zone result BEFORE voting (like Build Mode & Production)
+        zone_model_results_normalized = {}
+        if zone_model_results:
+            # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
+            zone_model_results_normalized, zone_normalized_text, zone_vote_count, zone_total_models = _normalize_and_vote(
+                zone_model_results, field_format, field_name, opts_items, working_zone_config.get('tie_break_prefer')
+            )
+            zone_normalized_text = zone_normalized_text or ""
+            zone_consensus_text = zone_normalized_text  # For display purposes
+
+            # Validate against pattern
+            zone_is_valid = bool(zone_normalized_text) and (validation_re is None or bool(validation_re.match(zone_normalized_text)))
+        else:
+            # Single model fallback
+            zone_consensus_text = extract_from_zone(words, zone_config_pure, word_bbox)
+            zone_normalized_text = _norm_cached(zone_consensus_text, field_format, field_name, opts_items) if zone_consensus_text else ""
+            zone_is_valid = bool(zone_normalized_text) and (validation_re is None or bool(validation_re.match(zone_normalized_text)))
+            zone_vote_count, zone_total_models = 1, 1
+            zone_model_results = {"single": zone_consensus_text}
+        
+        # 2. PATTERN-BASED EXTRACTION (pure pattern, if consensus_extract exists)
+        pattern_consensus_text = ""
+        pattern_normalized_text = ""
+        pattern_is_valid = False
+        pattern_vote_count = 0
+        pattern_total_models = 0
+        pattern_model_results = {}
+        pattern_model_results_normalized = {}
+        
+        if prep['has_pattern']:
             
-            # Get OCR result
-            ocr_result = call_ocr_api(img_bytes, file.name, api_url)
+            # Test pattern like Build Mode: expanded zone (+5%) first, then full document fallback
+            model_comparison = ocr_result.get('model_comparison', {})
+            per_model_outputs = model_comparison.get('per_model_outputs', {})
             
-            if ocr_result:
-                words = extract_words(ocr_result)
-                
-                # Extract all configured fields
-                field_results = {}
-                overall_valid = True
-                
-                for field_name, zone_config in st.session_state.zones.items():
-                    # Apply exporter logic to ensure normalized fields have consensus_extract
-                    # (this matches what the exporter does automatically)
-                    working_zone_config = zone_config.copy()
-                    if not working_zone_config.get('consensus_extract'):
-                        field_format = working_zone_config.get('format')
-                        if field_format in ['height', 'sex', 'eyes', 'hair', 'weight']:
-                            working_zone_config['consensus_extract'] = r".*"  # Match any text, let normalizer handle extraction
-                    
-                    # TEST BOTH EXTRACTION METHODS SEPARATELY
-                    
-                    # 1. ZONE-BASED EXTRACTION (pure zone, no pattern fallback)
-                    zone_config_pure = working_zone_config.copy()
-                    zone_config_pure.pop('consensus_extract', None)  # Remove pattern fallback
+            if per_model_outputs:
+                # Use extract_from_zone_multimodel on the expanded zone like Build Mode (correct approach!)
+                model_expanded_zone_results = extract_from_zone_multimodel(
+                    ocr_result, prep['expanded'], words, word_bbox, words_with_geom
+                )
+
+                # Models usually read the zone identically - run the pattern once per distinct text
+                extracted_by_text = {}
+                for model_name, model_data in per_model_outputs.items():
+                    # Get expanded zone text for this model
+                    expanded_zone_text = model_expanded_zone_results.get(model_name, '')
+                    if expanded_zone_text in extracted_by_text:
+                        pattern_model_results[model_name] = extracted_by_text[expanded_zone_text]
+                        continue
+
+                    # Test pattern on expanded zone ONLY (NO fallback to full document)
+                    extracted_value = ""
+                    if expanded_zone_text and consensus_re:
+                        match = consensus_re.search(expanded_zone_text)
+                        if match:
+                            if match.lastindex and match.lastindex >= 1:
+                                # Has capturing group (may not have participated in the match)
+                                extracted_value = (match.group(1) or '').strip()
+                            else:
+                                # No capturing group, use full match
+                                extracted_value = match.group(0).strip()
+
+                            # Apply cleanup to extracted value (not search text)
+                            if cleanup_re and extracted_value:
+                                extracted_value = cleanup_re.sub('', extracted_value).strip()
                     
-                    zone_model_results = extract_from_zone_multimodel(
-                        ocr_result,
-                        zone_config_pure,
-                        words
+                    extracted_by_text[expanded_zone_text] = extracted_value
+                    pattern_model_results[model_name] = extracted_value
+
+                # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
+                if pattern_model_results:
+                    pattern_model_results_normalized, pattern_normalized_text, pattern_vote_count, pattern_total_models = _normalize_and_vote(
+                        pattern_model_results, field_format, field_name, opts_items, working_zone_config.get('tie_break_prefer')
                     )
-                    
-                    # Normalize and validate EACH model's zone result BEFORE voting (like Build Mode & Production)
-                    field_format = working_zone_config.get('format', 'string')
-                    format_options = {}
-                    if field_format == 'date':
-                        format_options['date_format'] = working_zone_config.get('date_format', 'MM.DD.YYYY')
-                    elif field_format == 'height':
-                        format_options['height_format'] = working_zone_config.get('height_format', 'auto')
-                    elif field_format == 'weight':
-                        format_options['weight_format'] = working_zone_config.get('weight_format', 'auto')
-
-                    validation_pattern = working_zone_config.get('pattern', '')
-
-                    if zone_model_results:
-                        # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
-                        # Step 1: Normalize each model's result
-                        zone_model_results_normalized = {}
-                        for model_key, raw_value in zone_model_results.items():
-                            normalized_value = normalize_field(raw_value, field_format, field_name, **format_options) if raw_value else None
-                            if normalized_value:
-                                zone_model_results_normalized[model_key] = normalized_value
-
-                        # Step 2: Vote on normalized values using character-level voting
-                        if zone_model_results_normalized:
-                            from zone_builder.zone_operations import get_consensus_from_models
-                            zone_normalized_text, zone_vote_count, zone_total_models = get_consensus_from_models(
-                                zone_model_results_normalized,
-                                field_name,
-                                field_result.get('zone_config', {}).get('tie_break_prefer')
-                            )
-                            zone_consensus_text = zone_normalized_text  # For display purposes
-                        else:
-                            zone_consensus_text = ""
-                            zone_normalized_text = ""
-                            zone_vote_count, zone_total_models = 0, len(zone_model_results)
-
-                        # Validate against pattern
-                        zone_is_valid = bool(zone_normalized_text) and (not validation_pattern or bool(re.match(validation_pattern, zone_normalized_text)))
-                    else:
-                        # Single model fallback
-                        zone_consensus_text = extract_from_zone(words, zone_config_pure)
-                        zone_normalized_text = normalize_field(zone_consensus_text, field_format, field_name, **format_options) if zone_consensus_text else ""
-                        zone_is_valid = bool(zone_normalized_text) and (not validation_pattern or bool(re.match(validation_pattern, zone_normalized_text)))
-                        zone_vote_count, zone_total_models = 1, 1
-                        zone_model_results = {"single": zone_consensus_text}
-                    
-                    # 2. PATTERN-BASED EXTRACTION (pure pattern, if consensus_extract exists)
-                    pattern_results = {}
+                    pattern_normalized_text = pattern_normalized_text or ""
+                    pattern_consensus_text = pattern_normalized_text  # For display purposes
+
+                    # Validate against pattern
+                    pattern_is_valid = bool(pattern_normalized_text) and (validation_re is None or bool(validation_re.match(pattern_normalized_text)))
+                else:
+                    # No pattern results
                     pattern_consensus_text = ""
                     pattern_normalized_text = ""
                     pattern_is_valid = False
                     pattern_vote_count = 0
                     pattern_total_models = 0
-                    pattern_model_results = {}
-                    
-                    consensus_extract_pattern = working_zone_config.get('consensus_extract', '')
-                    if consensus_extract_pattern and consensus_extract_pattern.strip():
-                        consensus_pattern = consensus_extract_pattern
-                        cleanup_pattern = working_zone_config.get('cleanup_pattern', '')
-                        
-                        # Test pattern like Build Mode: expanded zone (+5%) first, then full document fallback
-                        model_comparison = ocr_result.get('model_comparison', {})
-                        per_model_outputs = model_comparison.get('per_model_outputs', {})
-                        
-                        if per_model_outputs:
-                            # Create expanded zone config (like Build Mode)
-                            y_min, y_max = working_zone_config['y_range']
-                            x_min, x_max = working_zone_config['x_range']
-                            expand_factor = 0.05  # 5% expansion like Build Mode
-
-                            expanded_y = (max(0, y_min - expand_factor), min(1, y_max + expand_factor))
-                            expanded_x = (max(0, x_min - expand_factor), min(1, x_max + expand_factor))
-
-                            expanded_zone_config = working_zone_config.copy()
-                            expanded_zone_config['y_range'] = expanded_y
-                            expanded_zone_config['x_range'] = expanded_x
-                            expanded_zone_config['cleanup_pattern'] = ''  # Don't apply cleanup to zone text
-
-                            # Use extract_from_zone_multimodel like Build Mode (correct approach!)
-                            model_expanded_zone_results = extract_from_zone_multimodel(
-                                ocr_result, expanded_zone_config, words
-                            )
-
-                            for model_name, model_data in per_model_outputs.items():
-                                # Get expanded zone text for this model
-                                expanded_zone_text = model_expanded_zone_results.get(model_name, '')
-
-                                # Test pattern on expanded zone ONLY (NO fallback to full document)
-                                extracted_value = ""
-                                if expanded_zone_text:
-                                    try:
-                                        match = re.search(consensus_pattern, expanded_zone_text, re.IGNORECASE | re.MULTILINE)
-                                        if match:
-                                            if match.lastindex and match.lastindex >= 1:
-                                                # Has capturing group
-                                                extracted_value = match.group(1).strip()
-                                            else:
-                                                # No capturing group, use full match
-                                                extracted_value = match.group(0).strip()
-
-                                            # Apply cleanup to extracted value (not search text)
-                                            if cleanup_pattern and extracted_value:
-                                                try:
-                                                    extracted_value = re.sub(cleanup_pattern, '', extracted_value, flags=re.IGNORECASE).strip()
-                                                except:
-                                                    pass
-                                    except:
-                                        pass
-                                
-                                pattern_model_results[model_name] = extracted_value
-
-                            # Normalize and validate EACH model's result BEFORE voting (like Build Mode & Production)
-                            field_format = working_zone_config.get('format', 'string')
-                            format_options = {}
-                            if field_format == 'date':
-                                format_options['date_format'] = working_zone_config.get('date_format', 'MM.DD.YYYY')
-                            elif field_format == 'height':
-                                format_options['height_format'] = working_zone_config.get('height_format', 'auto')
-                            elif field_format == 'weight':
-                                format_options['weight_format'] = working_zone_config.get('weight_format', 'auto')
-
-                            validation_pattern = working_zone_config.get('pattern', '')
-
-                            # Normalize PER MODEL first, THEN vote on normalized values (matches main OCR flow)
-                            if pattern_model_results:
-                                # Step 1: Normalize each model's result
-                                pattern_model_results_normalized = {}
-                                for model_key, raw_value in pattern_model_results.items():
-                                    normalized_value = normalize_field(raw_value, field_format, field_name, **format_options) if raw_value else None
-                                    if normalized_value:
-                                        pattern_model_results_normalized[model_key] = normalized_value
-
-                                # Step 2: Vote on normalized values using character-level voting
-                                if pattern_model_results_normalized:
-                                    from zone_builder.zone_operations import get_consensus_from_models
-                                    pattern_normalized_text, pattern_vote_count, pattern_total_models = get_consensus_from_models(
-                                        pattern_model_results_normalized,
-                                        field_name,
-                                        field_result.get('zone_config', {}).get('tie_break_prefer')
-                                    )
-                                    pattern_consensus_text = pattern_normalized_text  # For display purposes
-                                else:
-                                    pattern_consensus_text = ""
-                                    pattern_normalized_text = ""
-                                    pattern_vote_count, pattern_total_models = 0, len(pattern_model_results)
-
-                                # Validate against pattern
-                                pattern_is_valid = bool(pattern_normalized_text) and (not validation_pattern or bool(re.match(validation_pattern, pattern_normalized_text)))
-                            else:
-                                # No pattern results
-                                pattern_consensus_text = ""
-                                pattern_normalized_text = ""
-                                pattern_is_valid = False
-                                pattern_vote_count = 0
-                                pattern_total_models = 0
-                    
-                    # Store results for BOTH methods
-                    field_results[field_name] = {
-                        # Zone-based results
-                        'zone_raw_consensus': zone_consensus_text,
-                        'zone_normalized': zone_normalized_text,
-                        'zone_is_valid': zone_is_valid,
-                        'zone_vote_count': zone_vote_count,
-                        'zone_total_models': zone_total_models,
-                        'zone_model_results': zone_model_results,
-                        
-                        # Pattern-based results
-                        'pattern_raw_consensus': pattern_consensus_text,
-                        'pattern_normalized': pattern_normalized_text,
-                        'pattern_is_valid': pattern_is_valid,
-                        'pattern_vote_count': pattern_vote_count,
-                        'pattern_total_models': pattern_total_models,
-                        'pattern_model_results': pattern_model_results,
-                        'has_pattern': bool(consensus_extract_pattern and consensus_extract_pattern.strip()),
-                        
-                        # Common info
-                        'field_format': field_format,
-                        'format_options': format_options,
-                        'zone_config': working_zone_config
-                    }
-                    
-                    # Overall validity: either method should work
-                    if not (zone_is_valid or pattern_is_valid):
-                        overall_valid = False
-                
-                # Store test result
-                st.session_state.test_results.append({
-                    'image_name': file.name,
-                    'image': img,
-                    'overall_valid': overall_valid,
-                    'field_results': field_results,
-                    'total_fields': len(field_results),
-                    'valid_fields': sum(1 for r in field_results.values() if (r['zone_is_valid'] or r['pattern_is_valid']))
-                })
-                
-        except Exception as e:
-            st.error(f"Error processing {file.name}: {str(e)}")
         
-        progress_bar.progress((idx + 1) / len(test_files))
+        # Store results for BOTH methods
+        field_results[field_name] = {
+            # Zone-based results
+            'zone_raw_consensus': zone_consensus_text,
+            'zone_normalized': zone_normalized_text,
+            'zone_is_valid': zone_is_valid,
+            'zone_vote_count': zone_vote_count,
+            'zone_total_models': zone_total_models,
+            'zone_model_results': zone_model_results,
+            'zone_model_results_normalized': zone_model_results_normalized,
+            
+            # Pattern-based results
+            'pattern_raw_consensus': pattern_consensus_text,
+            'pattern_normalized': pattern_normalized_text,
+            'pattern_is_valid': pattern_is_valid,
+            'pattern_vote_count': pattern_vote_count,
+            'pattern_total_models': pattern_total_models,
+            'pattern_model_results': pattern_model_results,
+            'pattern_model_results_normalized': pattern_model_results_normalized,
+            'has_pattern': prep['has_pattern'],
+
+            # Display strings for the results view, built once here instead of on every rerun
+            'zone_display': _consensus_display(zone_consensus_text, zone_normalized_text),
+            'pattern_display': _consensus_display(pattern_consensus_text, pattern_normalized_text),
+            'zone_model_rows': _model_display_rows(zone_model_results, zone_model_results_normalized, zone_consensus_text),
+            'pattern_model_rows': _model_display_rows(pattern_model_results, pattern_model_results_normalized, pattern_consensus_text),
+            
+            # Common info
+            'field_format': field_format,
+            'format_options': format_options,
+            'zone_config': working_zone_config
+        }
+        
+        # Per-method tallies for the results summary
+        if zone_is_valid:
+            zone_valid_fields += 1
+        if prep['has_pattern']:
+            pattern_fields += 1
+            if pattern_is_valid:
+                pattern_valid_fields += 1
+
+        # Overall validity: either method should work
+        if zone_is_valid or pattern_is_valid:
+            valid_fields += 1
+        else:
+            overall_valid = False
     
+    return {
+        'image_name': image_name,
+        'thumbnail': thumbnail,
+        'overall_valid': overall_valid,
+        'field_results': field_results,
+        'total_fields': len(field_results),
+        'valid_fields': valid_fields,
+        'zone_valid_fields': zone_valid_fields,
+        'pattern_fields': pattern_fields,
+        'pattern_valid_fields': pattern_valid_fields
+    }
+
+
+def process_test_images_and_extract(test_files, api_url):
+    """Process test images and extract all fields using configured zones"""
+    st.session_state.test_results = []
+
+    # Zone configs don't change during a run - prepare each field's configs, format and regexes once
+    field_prep = {}
+    for field_name, zone_config in st.session_state.zones.items():
+        # Apply exporter logic to ensure normalized fields have consensus_extract
+        # (this matches what the exporter does automatically)
+        working_zone_config = zone_config.copy()
+        if not working_zone_config.get('consensus_extract'):
+            if working_zone_config.get('format') in ['height', 'sex', 'eyes', 'hair', 'weight']:
+                working_zone_config['consensus_extract'] = r".*"  # Match any text, let normalizer handle extraction
+
+        # Pure zone config (no pattern fallback) for zone-based extraction
+        zone_config_pure = working_zone_config.copy()
+        zone_config_pure.pop('consensus_extract', None)
+
+        # Expanded zone config (+5%, like Build Mode) for pattern-based extraction - pattern fields only
+        consensus_pattern = working_zone_config.get('consensus_extract', '')
+        has_pattern = bool(consensus_pattern.strip())
+        expanded_zone_config = None
+        if has_pattern:
+            y_min, y_max = working_zone_config['y_range']
+            x_min, x_max = working_zone_config['x_range']
+            expand_factor = 0.05
+            expanded_zone_config = working_zone_config.copy()
+            expanded_zone_config['y_range'] = (max(0, y_min - expand_factor), min(1, y_max + expand_factor))
+            expanded_zone_config['x_range'] = (max(0, x_min - expand_factor), min(1, x_max + expand_factor))
+            expanded_zone_config['cleanup_pattern'] = ''  # Don't apply cleanup to zone text
+
+        field_format, format_options = _fmt_opts(working_zone_config)
+
+        # Invalid consensus/cleanup patterns extract nothing / skip cleanup
+        validation_pattern = working_zone_config.get('pattern', '')
+        cleanup_pattern = working_zone_config.get('cleanup_pattern', '')
+        try:
+            validation_re = _compile(validation_pattern) if validation_pattern else None
+        except re.error as e:
+            st.error(f"Invalid validation pattern for {field_name}: {e}")
+            return
+        field_prep[field_name] = {
+            'working': working_zone_config,
+            'pure': zone_config_pure,
+            'has_pattern': has_pattern,
+            'expanded': expanded_zone_config,
+            'field_format': field_format,
+            'format_options': format_options,
+            'opts_items': tuple(sorted(format_options.items())),
+            'validation_re': validation_re,
+            'consensus_re': _safe_compile(consensus_pattern, re.IGNORECASE | re.MULTILINE) if has_pattern else None,
+            'cleanup_re': _safe_compile(cleanup_pattern, re.IGNORECASE) if cleanup_pattern else None,
+        }
+
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    # OCR is an HTTP round-trip per image, so send the requests concurrently (as process_images does);
+    # the workers also decode the thumbnails. Each image's fields are extracted as soon as its OCR result arrives, while the rest are in flight.
+    jobs = [(file, file.getvalue()) for file in test_files]
+    test_results = [None] * len(jobs)
+
+    with _ocr_executor(len(jobs)) as executor:
+        futures = {
+            executor.submit(_thumbnail_and_ocr, img_bytes, file.name, api_url): idx
+            for idx, (file, img_bytes) in enumerate(jobs)
+        }
+        last_update = 0.0
+        for done, future in enumerate(as_completed(futures), 1):
+            idx = futures[future]
+            file = jobs[idx][0]
+            try:
+                thumbnail, ocr_result = future.result()
+                if ocr_result:
+                    test_results[idx] = _extract_test_image(file.name, thumbnail, ocr_result, field_prep)
+            except Exception as e:
+                st.error(f"Error processing {file.name}: {str(e)}")
+            now = time.monotonic()
+            if done == len(jobs) or now - last_update >= _PROGRESS_INTERVAL:
+                last_update = now
+                status_text.text(f"Processing {file.name} ({done}/{len(jobs)})...")
+                progress_bar.progress(done / len(jobs))
+
+    # Keep upload order regardless of which request finished first
+    st.session_state.test_results = [result for result in test_results if result]
+
     status_text.empty()
     progress_bar.empty()
     
@@ -2106,6 +2484,72 @@ def process_test_images_and_extract(test_files, api_url):
         st.rerun()
 
 
+@st.fragment
+def render_test_field(result_idx: int, field_name: str, field_result: dict):
+    """
+    Body of one field's expander in the test results
+
+    A fragment, so toggling its per-model checkbox reruns only this field
+    instead of every image and field in the results.
+    """
+    zone_status = "✅" if field_result['zone_is_valid'] else "❌"
+    pattern_status = "✅" if field_result['pattern_is_valid'] else "❌"
+    has_pattern = field_result['has_pattern']
+
+    # Expander bodies run even when collapsed, so per-model rows are only built on request
+    show_models = st.checkbox(
+        "Show per-model results", value=False,
+        key=f"test_models_{result_idx}_{field_name}"
+    )
+
+    # Show both extraction methods side by side
+    if has_pattern:
+        col1, col2 = st.columns(2)
+        
+        # Zone-based extraction column
+        with col1:
+            st.markdown(f"**🎯 Zone-Based Extraction** {zone_status}")
+            st.code(field_result['zone_display'])
+            st.metric("Agreement", f"{field_result['zone_vote_count']}/{field_result['zone_total_models']}")
+            
+            # Zone model results
+            if show_models and len(field_result['zone_model_rows']) > 1:
+                st.markdown("**Per-model zone results:**")
+                _render_test_model_rows(field_result, 'zone')
+        
+        # Pattern-based extraction column
+        with col2:
+            st.markdown(f"**🔍 Pattern-Based Extraction** {pattern_status}")
+            st.code(field_result['pattern_display'])
+            
+            if field_result['pattern_total_models'] > 0:
+                st.metric("Agreement", f"{field_result['pattern_vote_count']}/{field_result['pattern_total_models']}")
+            else:
+                st.metric("Pattern", "Not configured")
+            
+            # Pattern model results
+            if show_models and len(field_result['pattern_model_rows']) > 1:
+                st.markdown("**Per-model pattern results:**")
+                _render_test_model_rows(field_result, 'pattern')
+            
+            # Show the pattern being used
+            if field_result['zone_config'].get('consensus_extract'):
+                st.markdown("**Pattern used:**")
+                st.code(field_result['zone_config']['consensus_extract'])
+
+    else:
+        # Zone-only field
+        st.markdown(f"**🎯 Zone-Based Extraction Only** {zone_status}")
+        st.info("💡 No pattern configured - add `consensus_extract` pattern for fallback extraction")
+        st.code(field_result['zone_display'])
+        st.metric("Agreement", f"{field_result['zone_vote_count']}/{field_result['zone_total_models']}")
+        
+        # Zone model results
+        if show_models and len(field_result['zone_model_rows']) > 1:
+            st.markdown("**Per-model zone results:**")
+            _render_test_model_rows(field_result, 'zone')
+
+
 def render_test_results():
     """Display comprehensive test results"""
     st.markdown("#### 📊 Test Results")
@@ -2114,22 +2558,11 @@ def render_test_results():
     total_images = len(st.session_state.test_results)
     fully_valid_images = sum(1 for result in st.session_state.test_results if result['overall_valid'])
     
-    # Calculate zone vs pattern success rates
-    zone_successes = 0
-    pattern_successes = 0
-    total_zone_fields = 0
-    total_pattern_fields = 0
-    
-    for result in st.session_state.test_results:
-        for field_result in result['field_results'].values():
-            total_zone_fields += 1
-            if field_result['zone_is_valid']:
-                zone_successes += 1
-            
-            if field_result['has_pattern']:
-                total_pattern_fields += 1
-                if field_result['pattern_is_valid']:
-                    pattern_successes += 1
+    # Zone vs pattern success rates, from the per-image tallies made at extraction time
+    zone_successes = sum(result['zone_valid_fields'] for result in st.session_state.test_results)
+    pattern_successes = sum(result['pattern_valid_fields'] for result in st.session_state.test_results)
+    total_zone_fields = sum(result['total_fields'] for result in st.session_state.test_results)
+    total_pattern_fields = sum(result['pattern_fields'] for result in st.session_state.test_results)
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -2144,7 +2577,7 @@ def render_test_results():
         st.metric("Pattern Success", f"{pattern_rate:.1f}%" if total_pattern_fields > 0 else "N/A")
     
     # Per-image results
-    for result in st.session_state.test_results:
+    for result_idx, result in enumerate(st.session_state.test_results):
         status_icon = "✅" if result['overall_valid'] else "❌"
         
         with st.expander(
@@ -2155,7 +2588,7 @@ def render_test_results():
             col1, col2 = st.columns([1, 2])
             
             with col1:
-                st.image(result['image'], caption=result['image_name'], width=200)
+                st.image(result['thumbnail'], caption=result['image_name'], width=_TEST_THUMB_WIDTH)
             
             with col2:
                 st.markdown("**Field Extraction Results:**")
@@ -2163,7 +2596,6 @@ def render_test_results():
                 # Field results table - show both zone-based and pattern-based
                 for field_name, field_result in result['field_results'].items():
                     zone_status = "✅" if field_result['zone_is_valid'] else "❌"
-                    pattern_status = "✅" if field_result['pattern_is_valid'] else "❌"
                     has_pattern = field_result['has_pattern']
                     
                     # Field summary line
@@ -2178,153 +2610,11 @@ def render_test_results():
                         overall_status = zone_status
                     
                     with st.expander(f"{overall_status} {field_name}: {summary}", expanded=False):
-                        # Show both extraction methods side by side
-                        if has_pattern:
-                            col1, col2 = st.columns(2)
-                            
-                            # Zone-based extraction column
-                            with col1:
-                                st.markdown(f"**🎯 Zone-Based Extraction** {zone_status}")
-
-                                # Display with arrow notation like Build Mode
-                                if field_result['zone_normalized'] != field_result['zone_raw_consensus'] and field_result['zone_normalized']:
-                                    consensus_display = f"{field_result['zone_raw_consensus'] or '(empty)'} → {field_result['zone_normalized']}"
-                                    st.code(consensus_display)
-                                else:
-                                    st.code(field_result['zone_raw_consensus'] or "(empty)")
-                                
-                                st.metric("Agreement", f"{field_result['zone_vote_count']}/{field_result['zone_total_models']}")
-                                
-                                # Zone model results
-                                if len(field_result['zone_model_results']) > 1:
-                                    st.markdown("**Per-model zone results:**")
-                                    for model_name, model_text in field_result['zone_model_results'].items():
-                                        # Normalize like Build Mode does (use normalize_field imported at top)
-                                        model_normalized = normalize_field(
-                                            model_text,
-                                            field_result['field_format'],
-                                            field_name,
-                                            **field_result['format_options']
-                                        ) if model_text else None
-
-                                        color = "#28a745" if model_text == field_result['zone_raw_consensus'] else "#6c757d"
-                                        status = "🏆" if model_text == field_result['zone_raw_consensus'] else "📝"
-
-                                        # Show arrow notation if normalized differs from raw (like Build Mode)
-                                        if model_text and model_text != model_normalized and model_normalized:
-                                            display = f"{model_text} → {model_normalized}"
-                                        else:
-                                            display = model_text or '(empty)'
-
-                                        st.markdown(f"""
-                                        <div style="margin: 2px 0; padding: 2px 6px; background: {color}15; border-left: 2px solid {color}; border-radius: 3px;">
-                                            <span style="color: {color}; font-weight: bold; font-size: 12px;">
-                                                {status} {model_name.upper()}:
-                                            </span>
-                                            <span style="color: #333; margin-left: 4px; font-family: monospace; font-size: 12px;">
-                                                {display}
-                                            </span>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                            
-                            # Pattern-based extraction column
-                            with col2:
-                                st.markdown(f"**🔍 Pattern-Based Extraction** {pattern_status}")
-
-                                # Display with arrow notation like Build Mode
-                                if field_result['pattern_normalized'] != field_result['pattern_raw_consensus'] and field_result['pattern_normalized']:
-                                    consensus_display = f"{field_result['pattern_raw_consensus'] or '(empty)'} → {field_result['pattern_normalized']}"
-                                    st.code(consensus_display)
-                                else:
-                                    st.code(field_result['pattern_raw_consensus'] or "(empty)")
-                                
-                                if field_result['pattern_total_models'] > 0:
-                                    st.metric("Agreement", f"{field_result['pattern_vote_count']}/{field_result['pattern_total_models']}")
-                                else:
-                                    st.metric("Pattern", "Not configured")
-                                
-                                # Pattern model results
-                                if len(field_result['pattern_model_results']) > 1:
-                                    st.markdown("**Per-model pattern results:**")
-                                    for model_name, model_text in field_result['pattern_model_results'].items():
-                                        # Normalize like Build Mode does (use normalize_field imported at top)
-                                        model_normalized = normalize_field(
-                                            model_text,
-                                            field_result['field_format'],
-                                            field_name,
-                                            **field_result['format_options']
-                                        ) if model_text else None
-
-                                        color = "#28a745" if model_text == field_result['pattern_raw_consensus'] else "#6c757d"
-                                        status = "🏆" if model_text == field_result['pattern_raw_consensus'] else "📝"
-
-                                        # Show arrow notation if normalized differs from raw (like Build Mode)
-                                        if model_text and model_text != model_normalized and model_normalized:
-                                            display = f"{model_text} → {model_normalized}"
-                                        else:
-                                            display = model_text or '(empty)'
-
-                                        st.markdown(f"""
-                                        <div style="margin: 2px 0; padding: 2px 6px; background: {color}15; border-left: 2px solid {color}; border-radius: 3px;">
-                                            <span style="color: {color}; font-weight: bold; font-size: 12px;">
-                                                {status} {model_name.upper()}:
-                                            </span>
-                                            <span style="color: #333; margin-left: 4px; font-family: monospace; font-size: 12px;">
-                                                {display}
-                                            </span>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                                
-                                # Show the pattern being used
-                                if field_result['zone_config'].get('consensus_extract'):
-                                    st.markdown("**Pattern used:**")
-                                    st.code(field_result['zone_config']['consensus_extract'])
-                        
-                        else:
-                            # Zone-only field
-                            st.markdown(f"**🎯 Zone-Based Extraction Only** {zone_status}")
-                            st.info("💡 No pattern configured - add `consensus_extract` pattern for fallback extraction")
-
-                            # Display with arrow notation like Build Mode
-                            if field_result['zone_normalized'] != field_result['zone_raw_consensus'] and field_result['zone_normalized']:
-                                consensus_display = f"{field_result['zone_raw_consensus'] or '(empty)'} → {field_result['zone_normalized']}"
-                                st.code(consensus_display)
-                            else:
-                                st.code(field_result['zone_raw_consensus'] or "(empty)")
-                            
-                            st.metric("Agreement", f"{field_result['zone_vote_count']}/{field_result['zone_total_models']}")
-                            
-                            # Zone model results
-                            if len(field_result['zone_model_results']) > 1:
-                                st.markdown("**Per-model zone results:**")
-                                for model_name, model_text in field_result['zone_model_results'].items():
-                                    # Normalize like Build Mode does (use normalize_field imported at top)
-                                    model_normalized = normalize_field(
-                                        model_text,
-                                        field_result['field_format'],
-                                        field_name,
-                                        **field_result['format_options']
-                                    ) if model_text else None
-
-                                    color = "#28a745" if model_text == field_result['zone_raw_consensus'] else "#6c757d"
-                                    status = "🏆" if model_text == field_result['zone_raw_consensus'] else "📝"
-
-                                    # Show arrow notation if normalized differs from raw (like Build Mode)
-                                    if model_text and model_text != model_normalized and model_normalized:
-                                        display = f"{model_text} → {model_normalized}"
-                                    else:
-                                        display = model_text or '(empty)'
-
-                                    st.markdown(f"""
-                                    <div style="margin: 2px 0; padding: 2px 6px; background: {color}15; border-left: 2px solid {color}; border-radius: 3px;">
-                                        <span style="color: {color}; font-weight: bold; font-size: 12px;">
-                                            {status} {model_name.upper()}:
-                                        </span>
-                                        <span style="color: #333; margin-left: 4px; font-family: monospace; font-size: 12px;">
-                                            {display}
-                                        </span>
-                                    </div>
-                                    """, unsafe_allow_html=True)
+                        render_test_field(result_idx, field_name, field_result)
+
+
+# Page renderer per view_mode
+_VIEWS = {'build': render_build_mode, 'test': render_test_mode, 'export': render_export_mode}
 
 
 def main():
@@ -2332,12 +2622,7 @@ def main():
     render_header()
     render_sidebar()
 
-    if st.session_state.view_mode == 'build':
-        render_build_mode()
-    elif st.session_state.view_mode == 'test':
-        render_test_mode()
-    elif st.session_state.view_mode == 'export':
-        render_export_mode()
+    _VIEWS.get(st.session_state.view_mode, render_build_mode)()
 
 
 if __name__ == "__main__":
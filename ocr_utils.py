@@ -5,22 +5,50 @@ OCR Utilities
 OCR API interaction and word extraction
 """
 
+import random
+import threading
+import time
+
 import requests
 from typing import Dict, List, Optional
 from PIL import Image, ImageDraw
 
 
-def call_ocr_api(image_bytes: bytes, filename: str, api_url: str) -> Optional[Dict]:
-    """Call OCR API"""
-    try:
-        files = {'files': (filename, image_bytes, 'image/jpeg')}
-        params = {'include_details': True, 'enable_field_extraction': False}
-        response = requests.post(api_url, files=files, params=params, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            return data[0] if data else None
-    except Exception as e:
-        return None
+_RETRY_STATUSES = (429, 502, 503, 504)  # Throttled / temporarily unavailable - worth retrying
+_MAX_IN_FLIGHT = 8  # OCR requests in flight at once, across all sessions of this process
+_in_flight = threading.BoundedSemaphore(_MAX_IN_FLIGHT)
+
+
+def _retry_delay(attempt: int, response=None, base: float = 1.0, cap: float = 30.0) -> float:
+    """Seconds to wait after failed attempt number `attempt` (0-based)"""
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    if retry_after.isdigit():
+        return min(cap, float(retry_after))
+    return min(cap, base * 2 ** attempt) + random.uniform(0, 0.25)
+
+
+def call_ocr_api(image_bytes: bytes, filename: str, api_url: str, max_tries: int = 3) -> Optional[Dict]:
+    """Call OCR API, retrying throttled and timed-out requests with exponential backoff"""
+    files = {'files': (filename, image_bytes, 'image/jpeg')}
+    params = {'include_details': True, 'enable_field_extraction': False}
+
+    for attempt in range(max_tries):
+        response = None
+        try:
+            with _in_flight:
+                response = requests.post(api_url, files=files, params=params, timeout=30)
+            if response.status_code == 200:
+                data = response.json()
+                return data[0] if data else None
+            if response.status_code not in _RETRY_STATUSES:
+                return None
+        except (requests.Timeout, requests.ConnectionError):
+            pass
+        except Exception as e:
+            return None
+
+        if attempt + 1 < max_tries:
+            time.sleep(_retry_delay(attempt, response))
     return None
 
 
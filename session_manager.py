@@ -76,7 +76,14 @@ def save_session(session_state: Dict[str, Any],
         }
 
         # Include image as base64 if requested
-        if include_images and 'image' in img_data:
+        if include_images and 'image_bytes' in img_data:
+            # Original upload bytes: store as-is instead of decoding and re-encoding
+            try:
+                image_entry['image_base64'] = base64.b64encode(img_data['image_bytes']).decode('utf-8')
+                image_entry['image_size'] = Image.open(io.BytesIO(img_data['image_bytes'])).size
+            except Exception as e:
+                print(f"Warning: Could not save image {img_data['name']}: {e}")
+        elif include_images and 'image' in img_data:
             try:
                 image_entry['image_base64'] = image_to_base64(img_data['image'])
                 image_entry['image_size'] = img_data['image'].size
@@ -6,14 +6,15 @@ REFACTORED: Minimal zone-builder-specific functions only.
 All extraction logic now lives in shared app.field_extraction module.
 
 Functions kept here:
-- validate_consensus_pattern: UI regex validation
 - calculate_aggregate_zone: UI aggregate zone calculation
 - extract_from_zone_multimodel_with_words: Zone builder multi-model display
+- ocr_words_with_geom: per-image word geometry shared by the multi-model extractors
 """
 
-import re
 from typing import Dict, List, Optional, Tuple, Set, Any
 
+import numpy as np
+
 # Import from shared modules (single source of truth)
 try:
     # Try importing when run from main app
@@ -36,21 +37,51 @@ except ImportError:
     )
 
 
-def validate_consensus_pattern(pattern: str) -> Tuple[bool, str]:
+def word_bbox_array(words: List[Dict]) -> np.ndarray:
     """
-    Validate consensus_extract pattern syntax (UI validation)
+    Build an (N, 4) array of word boxes [x1, y1, x2, y2] for vectorized zone tests
 
-    Returns:
-        (is_valid, error_message)
+    Row i corresponds to words[i]; compute once per image and reuse for every zone.
+    Missing coordinates default to 0.
     """
-    if not pattern:
-        return True, ""
+    return np.array(
+        [(w.get('x1', 0), w.get('y1', 0), w.get('x2', 0), w.get('y2', 0)) for w in words],
+        dtype=np.float64
+    ).reshape(-1, 4)
+
+
+def filter_words_in_zone(
+    words: List[Dict],
+    x_range: Tuple[float, float],
+    y_range: Tuple[float, float],
+    word_bbox: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Return non-noise words inside the zone (shared is_in_zone semantics)
 
-    try:
-        re.compile(pattern)
-        return True, ""
-    except re.error as e:
-        return False, f"Invalid regex: {e}"
+    If word_bbox (from word_bbox_array) is given, words whose boxes do not
+    overlap the zone at all are discarded with one vectorized test first, so
+    is_in_zone only runs on the few candidates near the zone.
+
+    The prefilter is only exact while is_in_zone never accepts a word whose
+    box lies entirely outside the ranges - true for box containment, overlap
+    and centre-point (center_x/center_y, the box midpoint) rules. If
+    is_in_zone gains a margin or tolerance, widen the prefilter bounds by the
+    same amount (or call without word_bbox).
+    """
+    if word_bbox is not None and len(word_bbox) == len(words):
+        x_lo, x_hi = min(x_range), max(x_range)
+        y_lo, y_hi = min(y_range), max(y_range)
+        candidates = np.flatnonzero(
+            (word_bbox[:, 0] <= x_hi) & (word_bbox[:, 2] >= x_lo) &
+            (word_bbox[:, 1] <= y_hi) & (word_bbox[:, 3] >= y_lo)
+        )
+        words = [words[i] for i in candidates]
+
+    return [
+        w for w in words
+        if is_in_zone(w, x_range, y_range) and not w.get('is_noise', False)
+    ]
 
 
 def apply_clustering(zone_words: List[Dict], zone_config: Dict) -> List[Dict]:
@@ -87,8 +118,7 @@ def calculate_aggregate_zone(
     Returns:
         Zone configuration dict with x_range, y_range, and metadata
     """
-    all_x_coords = []
-    all_y_coords = []
+    boxes = []
     selected_texts = []
 
     for img_idx, word_indices in selections.items():
@@ -96,21 +126,29 @@ def calculate_aggregate_zone(
             continue
 
         words = images[img_idx]['words']
-        for word_idx in word_indices:
-            if word_idx < len(words):
-                word = words[word_idx]
-                all_x_coords.extend([word['x1'], word['x2']])
-                all_y_coords.extend([word['y1'], word['y2']])
-                selected_texts.append(word['text'])
-
-    if not all_x_coords:
+        valid = [word_idx for word_idx in word_indices if word_idx < len(words)]
+        if not valid:
+            continue
+
+        # Reuse the image's cached box array when the UI has built one
+        word_bbox = images[img_idx].get('word_bbox')
+        if word_bbox is not None and len(word_bbox) == len(words):
+            boxes.append(word_bbox[valid])
+        else:
+            boxes.append(word_bbox_array([words[word_idx] for word_idx in valid]))
+        selected_texts.extend(words[word_idx]['text'] for word_idx in valid)
+
+    if not boxes:
         return None
 
-    # Calculate min/max with margin
-    x_min = max(0.0, min(all_x_coords) - margin)
-    x_max = min(1.0, max(all_x_coords) + margin)
-    y_min = max(0.0, min(all_y_coords) - margin)
-    y_max = min(1.0, max(all_y_coords) + margin)
+    # Calculate min/max with margin - one reduction over every selected box
+    boxes = np.concatenate(boxes)
+    box_min = boxes.min(axis=0)
+    box_max = boxes.max(axis=0)
+    x_min = max(0.0, float(min(box_min[0], box_min[2])) - margin)
+    x_max = min(1.0, float(max(box_max[0], box_max[2])) + margin)
+    y_min = max(0.0, float(min(box_min[1], box_min[3])) - margin)
+    y_max = min(1.0, float(max(box_max[1], box_max[3])) + margin)
 
     return {
         'x_range': (round(x_min, 3), round(x_max, 3)),
@@ -124,7 +162,7 @@ def calculate_aggregate_zone(
     }
 
 
-def extract_from_zone(words: List[Dict], zone_config: Dict) -> str:
+def extract_from_zone(words: List[Dict], zone_config: Dict, word_bbox: Optional[np.ndarray] = None) -> str:
     """
     Extract text from zone with clustering and cleanup (Zone Builder UI wrapper).
 
@@ -133,28 +171,53 @@ def extract_from_zone(words: List[Dict], zone_config: Dict) -> str:
     Args:
         words: List of word dictionaries with geometry
         zone_config: Zone configuration dict
+        word_bbox: Optional cached word_bbox_array(words) for vectorized filtering
 
     Returns:
         Extracted text string
     """
-    x_range = zone_config['x_range']
-    y_range = zone_config['y_range']
-
     # Filter words to zone (skip noise-flagged detections)
-    zone_words = [
-        w for w in words
-        if is_in_zone(w, x_range, y_range) and not w.get('is_noise', False)
-    ]
+    zone_words = filter_words_in_zone(words, zone_config['x_range'], zone_config['y_range'], word_bbox)
 
     # Use shared pipeline for extraction
     pipeline = ZoneExtractionPipeline()
     return pipeline.extract_from_zone(zone_words, zone_config) or ""
 
 
+def ocr_words_with_geom(ocr_result: Dict) -> List[Dict]:
+    """
+    All OCR words with geometry, in the order per_model_outputs words are aligned to
+
+    Depends only on the OCR result - build once per image and pass to the
+    multi-model extractors instead of re-walking the page for every zone.
+    """
+    all_words_with_geom = []
+    if 'items' in ocr_result and ocr_result['items']:
+        page = ocr_result['items'][0]
+        for block in page.get('blocks', []):
+            for line in block.get('lines', []):
+                for word_obj in line.get('words', []):
+                    geom = word_obj.get('geometry', [])
+                    if len(geom) == 4:
+                        x1, y1, x2, y2 = geom
+                        all_words_with_geom.append({
+                            'value': word_obj.get('value', ''),
+                            'center_x': (x1 + x2) / 2,
+                            'center_y': (y1 + y2) / 2,
+                            'x1': x1,
+                            'y1': y1,
+                            'x2': x2,
+                            'y2': y2,
+                        })
+    return all_words_with_geom
+
+
 def extract_from_zone_multimodel(
     ocr_result: Dict,
     zone_config: Dict,
-    consensus_words: List[Dict]
+    consensus_words: List[Dict],
+    word_bbox: Optional[np.ndarray] = None,
+    words_with_geom: Optional[List[Dict]] = None
 ) -> Dict[str, str]:
     """
     Extract text from zone for ALL OCR models (Zone Builder UI wrapper).
@@ -163,7 +226,7 @@ def extract_from_zone_multimodel(
         Dict mapping model name to extracted text
     """
     results_with_words = extract_from_zone_multimodel_with_words(
-        ocr_result, zone_config, consensus_words
+        ocr_result, zone_config, consensus_words, word_bbox, words_with_geom
     )
     # Extract just the text from (text, words) tuples
     return {model: text for model, (text, words) in results_with_words.items()}
@@ -172,32 +235,35 @@ def extract_from_zone_multimodel(
 def extract_from_zone_multimodel_with_words(
     ocr_result: Dict,
     zone_config: Dict,
-    consensus_words: List[Dict]
+    consensus_words: List[Dict],
+    word_bbox: Optional[np.ndarray] = None,
+    words_with_geom: Optional[List[Dict]] = None
 ) -> Dict[str, Tuple[str, List[Dict]]]:
     """
     Extract text AND word objects from zone for ALL OCR models (Zone Builder UI)
 
     This is zone-builder specific - shows per-model outputs in the UI.
 
+    Args:
+        word_bbox: Optional cached word_bbox_array(consensus_words) for vectorized filtering
+        words_with_geom: Optional cached ocr_words_with_geom(ocr_result)
+
     Returns:
         Dict mapping model name to (text, word_objects_list) tuple
     """
     results = {}
-    x_range = zone_config['x_range']
-    y_range = zone_config['y_range']
 
     # Find which consensus words are in the zone
     zone_word_boxes = []
-    for word in consensus_words:
-        if is_in_zone(word, x_range, y_range) and not word.get('is_noise', False):
-            zone_word_boxes.append({
-                'center_x': word.get('center_x'),
-                'center_y': word.get('center_y'),
-                'x1': word.get('x1'),
-                'y1': word.get('y1'),
-                'x2': word.get('x2'),
-                'y2': word.get('y2'),
-            })
+    for word in filter_words_in_zone(consensus_words, zone_config['x_range'], zone_config['y_range'], word_bbox):
+        zone_word_boxes.append({
+            'center_x': word.get('center_x'),
+            'center_y': word.get('center_y'),
+            'x1': word.get('x1'),
+            'y1': word.get('y1'),
+            'x2': word.get('x2'),
+            'y2': word.get('y2'),
+        })
 
     if not zone_word_boxes:
         return {}
@@ -210,24 +276,7 @@ def extract_from_zone_multimodel_with_words(
         return {}
 
     # Get all words with geometry from OCR result
-    all_words_with_geom = []
-    if 'items' in ocr_result and ocr_result['items']:
-        page = ocr_result['items'][0]
-        for block in page.get('blocks', []):
-            for line in block.get('lines', []):
-                for word_obj in line.get('words', []):
-                    geom = word_obj.get('geometry', [])
-                    if len(geom) == 4:
-                        x1, y1, x2, y2 = geom
-                        all_words_with_geom.append({
-                            'value': word_obj.get('value', ''),
-                            'center_x': (x1 + x2) / 2,
-                            'center_y': (y1 + y2) / 2,
-                            'x1': x1,
-                            'y1': y1,
-                            'x2': x2,
-                            'y2': y2,
-                        })
+    all_words_with_geom = words_with_geom if words_with_geom is not None else ocr_words_with_geom(ocr_result)
 
     # Use shared zone extraction pipeline
     pipeline = ZoneExtractionPipeline()